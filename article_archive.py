@@ -0,0 +1,179 @@
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+
+def link_hash(link):
+    return hashlib.sha1(link.encode("utf-8")).hexdigest()
+
+
+class ArticleArchive:
+    """
+    Append-only archive of every crawled article.
+
+    Articles go to one segment per day (articles-YYYY-MM-DD.jsonl.gz). Every append writes one gzip member
+    of JSON lines at the end of the segment, so nothing is ever rewritten, and a member can be read on its
+    own by seeking to its offset. A SQLite index maps link hashes to (segment, offset, line) and keeps
+    per-member date/category/query metadata, so lookups and filtered scans only decompress what they need.
+    """
+
+    def __init__(self, root=".cache/archive"):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(root, "index.sqlite"), check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS members (
+                id INTEGER PRIMARY KEY,
+                segment TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                run_at REAL NOT NULL,
+                count INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_members_day ON members(day);
+            CREATE TABLE IF NOT EXISTS articles (
+                link_hash TEXT NOT NULL,
+                member_id INTEGER NOT NULL REFERENCES members(id),
+                line INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                category TEXT,
+                query TEXT,
+                pub_ts REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_link ON articles(link_hash);
+            CREATE INDEX IF NOT EXISTS idx_articles_day ON articles(day, category, query);
+            CREATE TABLE IF NOT EXISTS links (
+                link_hash TEXT PRIMARY KEY,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                runs INTEGER NOT NULL
+            ) WITHOUT ROWID;
+        """)
+        self.conn.commit()
+
+    @classmethod
+    def from_env(cls):
+        return cls(root=os.getenv("ARTICLE_ARCHIVE_DIR", ".cache/archive"))
+
+    def close(self):
+        self.conn.close()
+
+    def _segment_path(self, segment):
+        return os.path.join(self.root, segment)
+
+    def append(self, news_data, run_at=None):
+        """
+        Archives one crawl result ({category: [item, ...]}). Returns the number of articles written.
+        """
+        run_at = run_at or time.time()
+        day = datetime.fromtimestamp(run_at).strftime("%Y-%m-%d")
+        records = []
+        for cat, items in news_data.items():
+            for item in items:
+                records.append({
+                    "link": item["link"],
+                    "title": item["title"],
+                    "description": item.get("description", ""),
+                    "category": cat,
+                    "query": item.get("query"),
+                    "pub_ts": item.get("pub_ts"),
+                    "is_new": item.get("is_new"),
+                    "run_at": run_at
+                })
+        if not records:
+            return 0
+
+        data = gzip.compress("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode("utf-8"))
+        segment = f"articles-{day}.jsonl.gz"
+        with self._lock:
+            # 세그먼트 끝에 gzip 멤버 하나를 추가 (기존 데이터는 수정하지 않음)
+            with open(self._segment_path(segment), "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            with self.conn:
+                member_id = self.conn.execute(
+                    "INSERT INTO members (segment, offset, length, day, run_at, count) VALUES (?, ?, ?, ?, ?, ?)",
+                    (segment, offset, len(data), day, run_at, len(records))
+                ).lastrowid
+                rows = []
+                counted = set()
+                for line, r in enumerate(records):
+                    h = link_hash(r["link"])
+                    rows.append((h, member_id, line, day, r["category"], r["query"], r["pub_ts"]))
+                    if h in counted:
+                        continue
+                    counted.add(h)
+                    self.conn.execute(
+                        "INSERT INTO links (link_hash, first_seen, last_seen, runs) VALUES (?, ?, ?, 1) "
+                        "ON CONFLICT(link_hash) DO UPDATE SET last_seen = excluded.last_seen, runs = runs + 1",
+                        (h, day, day)
+                    )
+                self.conn.executemany(
+                    "INSERT INTO articles (link_hash, member_id, line, day, category, query, pub_ts) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+                )
+        return len(records)
+
+    def _read_member(self, member_id):
+        segment, offset, length = self.conn.execute(
+            "SELECT segment, offset, length FROM members WHERE id = ?", (member_id,)
+        ).fetchone()
+        with open(self._segment_path(segment), "rb") as f:
+            f.seek(offset)
+            data = f.read(length)
+        return gzip.decompress(data).decode("utf-8").splitlines()
+
+    def seen(self, link):
+        """
+        Cross-run dedup: {'first_seen', 'last_seen', 'runs'} for a link, or None if it was never archived.
+        """
+        row = self.conn.execute("SELECT first_seen, last_seen, runs FROM links WHERE link_hash = ?",
+                                (link_hash(link),)).fetchone()
+        return {"first_seen": row[0], "last_seen": row[1], "runs": row[2]} if row else None
+
+    def get(self, link):
+        """
+        The most recently archived record for 'link', or None.
+        """
+        row = self.conn.execute(
+            "SELECT member_id, line FROM articles WHERE link_hash = ? ORDER BY member_id DESC LIMIT 1",
+            (link_hash(link),)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(self._read_member(row[0])[row[1]])
+
+    def scan(self, since=None, until=None, category=None, query=None):
+        """
+        Yields archived records filtered by run day ('YYYY-MM-DD', inclusive), category and query.
+        Only the gzip members holding matching rows are read, one at a time.
+        """
+        sql = "SELECT member_id, line FROM articles WHERE 1=1"
+        args = []
+        for clause, value in (("day >= ?", since), ("day <= ?", until), ("category = ?", category),
+                              ("query = ?", query)):
+            if value is not None:
+                sql += f" AND {clause}"
+                args.append(value)
+        sql += " ORDER BY member_id, line"
+
+        current_id, lines = None, None
+        for member_id, line in self.conn.execute(sql, args):
+            if member_id != current_id:
+                current_id, lines = member_id, self._read_member(member_id)
+            yield json.loads(lines[line])
+
+    def stats(self):
+        members, articles = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(count), 0) FROM members").fetchone()
+        links = self.conn.execute("SELECT COUNT(*) FROM links").fetchone()[0]
+        size = sum(os.path.getsize(self._segment_path(n)) for n in os.listdir(self.root) if n.endswith(".jsonl.gz"))
+        return {"runs": members, "articles": articles, "links": links, "bytes": size}
@@ -0,0 +1,117 @@
+import math
+from collections import Counter, defaultdict
+
+from minutes_retriever import tokenize
+from noise_filter import clean_text
+
+
+class UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def tfidf_vectors(texts, max_df=0.5):
+    """
+    L2-normalized TF-IDF vectors as sparse dicts {term: weight}. Terms found in more than 'max_df' of the
+    documents carry no event signal and are dropped (only for larger sets, where the ratio is meaningful).
+    """
+    tfs = [Counter(tokenize(text)) for text in texts]
+    df = Counter(term for tf in tfs for term in tf)
+    n = len(texts)
+    limit = max_df * n if n >= 20 else n
+    vectors = []
+    for tf in tfs:
+        vec = {t: (1 + math.log(c)) * (math.log((1 + n) / (1 + df[t])) + 1) for t, c in tf.items() if df[t] <= limit}
+        norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+        vectors.append({t: w / norm for t, w in vec.items()})
+    return vectors
+
+
+def similar_pairs(vectors, threshold):
+    """
+    Yields (i, j, cosine) for i < j with cosine >= threshold. Dot products are accumulated through an
+    inverted index, so only documents sharing a term are ever compared.
+    """
+    postings = defaultdict(list)
+    for doc_id, vec in enumerate(vectors):
+        for term, weight in vec.items():
+            postings[term].append((doc_id, weight))
+
+    for i, vec in enumerate(vectors):
+        scores = defaultdict(float)
+        for term, weight in vec.items():
+            for j, other in postings[term]:
+                if j > i:
+                    scores[j] += weight * other
+        for j, score in scores.items():
+            if score >= threshold:
+                yield i, j, score
+
+
+class ArticleClusterer:
+    """
+    Groups articles that report the same event (TF-IDF over cleaned title + description, cosine similarity,
+    union-find). Each cluster is replaced by its most central article, which keeps the other members' links
+    under 'related' so every citation remains available. Plain Python with sparse dicts, no NumPy needed.
+    """
+
+    def __init__(self, threshold=0.45, max_df=0.5):
+        self.threshold = threshold
+        self.max_df = max_df
+        self.stats = {"articles": 0, "clusters": 0, "merged": 0}
+        self._sims = {}
+
+    def cluster(self, items):
+        """
+        Returns clusters as lists of indices into 'items', in order of their first member.
+        """
+        if len(items) < 2:
+            return [[i] for i in range(len(items))]
+        texts = [clean_text(f"{item['title']} {item.get('description', '')}") for item in items]
+        vectors = tfidf_vectors(texts, self.max_df)
+        uf = UnionFind(len(items))
+        self._sims = defaultdict(float)
+        for i, j, score in similar_pairs(vectors, self.threshold):
+            uf.union(i, j)
+            self._sims[i] += score
+            self._sims[j] += score
+        groups = defaultdict(list)
+        for i in range(len(items)):
+            groups[uf.find(i)].append(i)
+        return sorted(groups.values(), key=lambda g: g[0])
+
+    def collapse(self, items):
+        """
+        Returns one representative per cluster; its 'related' holds the other members' title/link.
+        """
+        result = []
+        for group in self.cluster(items):
+            # 클러스터 내 유사도 합이 가장 큰(가장 중심적인) 기사를 대표로 선택
+            rep = max(group, key=lambda i: (self._sims.get(i, 0.0), -i)) if len(group) > 1 else group[0]
+            item = dict(items[rep])
+            related = [{"title": items[i]["title"], "link": items[i]["link"]} for i in group if i != rep]
+            if related:
+                item["related"] = related
+            result.append(item)
+        self.stats["articles"] += len(items)
+        self.stats["clusters"] += len(result)
+        self.stats["merged"] += len(items) - len(result)
+        return result
+
+    def collapse_all(self, news_data):
+        return {cat: self.collapse(items) for cat, items in news_data.items()}
+
+    def summary(self):
+        s = self.stats
+        return f"기사 {s['articles']}건 -> 사건 {s['clusters']}건 (관련 기사 {s['merged']}건 통합)"
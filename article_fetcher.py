@@ -0,0 +1,176 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+try:
+    import lxml  # noqa: F401
+    _PARSER = "lxml"
+except ImportError:
+    _PARSER = "html.parser"
+
+# 주요 언론사/네이버 뉴스 본문 컨테이너
+_BODY_SELECTORS = [
+    "#dic_area", "#newsct_article", "#articleBodyContents", "#articleBody", "#article-view-content-div",
+    "[itemprop=articleBody]", ".article_body", ".article-body", ".news_body", "#news_body_area", "article"
+]
+_STRIP_TAGS = ["script", "style", "noscript", "iframe", "nav", "header", "footer", "aside", "form", "figure"]
+_SPACE_RE = re.compile(r"\s+")
+
+
+def extract_body(html):
+    """
+    Extracts the main article text from an HTML page (known body containers first, then the densest <p> block).
+    """
+    soup = BeautifulSoup(html, _PARSER)
+    for tag in soup(_STRIP_TAGS):
+        tag.decompose()
+
+    node = None
+    for selector in _BODY_SELECTORS:
+        node = soup.select_one(selector)
+        if node is not None and len(node.get_text(strip=True)) > 200:
+            break
+        node = None
+
+    if node is None:
+        # 본문 컨테이너를 못 찾으면 <p> 텍스트가 가장 많은 부모 요소를 사용
+        scores = {}
+        for p in soup.find_all("p"):
+            parent = p.parent
+            scores[parent] = scores.get(parent, 0) + len(p.get_text(strip=True))
+        if not scores:
+            return ""
+        node = max(scores, key=scores.get)
+
+    return _SPACE_RE.sub(" ", node.get_text(" ", strip=True)).strip()
+
+
+class ArticleFetcher:
+    """
+    Optional enrichment step: downloads the full text of crawled articles.
+    Requests run on a thread pool with a per-host concurrency cap and timeouts. Extracted text is cached
+    on disk by content hash, with a URL index, so an article is never downloaded twice across runs.
+    Failures are skipped and the article keeps its Naver snippet only.
+    """
+
+    def __init__(self, cache_dir=".cache/articles", max_workers=8, per_host=2, timeout=8, max_chars=3000):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_chars = max_chars
+        self.stats = {"cached": 0, "fetched": 0, "failed": 0}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        self.index = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error reading article index {self.index_path}: {e}")
+
+        self._lock = threading.Lock()
+        self._host_limits = {}
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=self.per_host)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"User-Agent": "Mozilla/5.0 (compatible; report-bot/1.0)"})
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_workers=int(os.getenv("ENRICH_WORKERS", 8)),
+            per_host=int(os.getenv("ENRICH_PER_HOST", 2)),
+            timeout=float(os.getenv("ENRICH_TIMEOUT", 8))
+        )
+
+    def _text_path(self, content_hash):
+        return os.path.join(self.cache_dir, f"{content_hash}.txt.gz")
+
+    def _host_limit(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_limits[host]
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _read_cached(self, url):
+        content_hash = self.index.get(url)
+        if not content_hash:
+            return None
+        try:
+            with gzip.open(self._text_path(content_hash), "rt", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def fetch(self, url):
+        """
+        Returns the extracted body text for 'url' (from cache when possible), or None on failure.
+        """
+        cached = self._read_cached(url)
+        if cached is not None:
+            self._count("cached")
+            return cached
+
+        try:
+            with self._host_limit(url):
+                response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            text = extract_body(response.content)
+        except Exception as e:
+            print(f"   - 본문 수집 실패 ({url}): {e}")
+            self._count("failed")
+            return None
+        if not text:
+            self._count("failed")
+            return None
+
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        path = self._text_path(content_hash)
+        # 같은 본문(통신사 전재 등)은 한 번만 저장
+        if not os.path.exists(path):
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        with self._lock:
+            self.index[url] = content_hash
+        self._count("fetched")
+        return text
+
+    def enrich(self, news_data):
+        """
+        Adds a 'body' field (truncated to max_chars) to every article whose full text could be fetched.
+        """
+        items = [item for items in news_data.values() for item in items if item.get("link")]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            bodies = list(executor.map(lambda item: self.fetch(item["link"]), items))
+        for item, body in zip(items, bodies):
+            if body:
+                item["body"] = body[:self.max_chars]
+        self._save_index()
+        print(f"   - 기사 본문: 캐시 {self.stats['cached']}건, 신규 {self.stats['fetched']}건, 실패 {self.stats['failed']}건")
+        return news_data
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
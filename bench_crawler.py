@@ -0,0 +1,64 @@
+"""
+Crawler load test against the local mock Naver search server.
+
+    python bench_crawler.py --scales 1 10 100 --latency 0.05 --rate-429 0.02 --qps 10 --workers 4
+"""
+import argparse
+import time
+
+from mock_naver_server import MockNaverServer, build_corpus
+from news_cache import NewsResponseCache
+from news_crawler import NewsCrawler
+
+
+def run_once(scale, latency, rate_429, rate_5xx, qps, workers):
+    corpus = build_corpus(scale=scale)
+    with MockNaverServer(corpus, latency=latency, rate_429=rate_429, rate_5xx=rate_5xx) as server:
+        crawler = NewsCrawler(max_workers=workers, qps=qps, cache=NewsResponseCache(mode="off"))
+        crawler.base_url = server.url
+
+        started = time.perf_counter()
+        news_data = crawler.get_daily_reports()
+        wall = time.perf_counter() - started
+
+        near_dup = crawler.last_pipeline.stage("near_dup")
+        return {
+            "scale": scale,
+            "corpus": len(corpus),
+            "requests": crawler.stats["requests"],
+            "retries": crawler.stats["retries"],
+            "errors": crawler.stats["errors"],
+            "server_429": server.stats["429"],
+            "server_5xx": server.stats["5xx"],
+            "kept": sum(len(items) for items in news_data.values()),
+            "wall": wall,
+            "qps": crawler.stats["requests"] / wall if wall else 0.0,
+            "dedup_s": near_dup.elapsed + crawler.last_pipeline.stage("url_dedup").elapsed,
+            "comparisons": near_dup.title_index.comparisons
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--qps", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    rows = []
+    for scale in args.scales:
+        print(f"▶ {scale}x 데이터로 수집 실행...")
+        rows.append(run_once(scale, args.latency, args.rate_429, args.rate_5xx, args.qps, args.workers))
+
+    print("\nscale | corpus | requests | retries | errors | 429/5xx | kept | wall(s) | qps | dedup(s) | comparisons")
+    for r in rows:
+        print(f"{r['scale']:>5} | {r['corpus']:>6} | {r['requests']:>8} | {r['retries']:>7} | {r['errors']:>6} | "
+              f"{r['server_429']}/{r['server_5xx']:<5} | {r['kept']:>4} | {r['wall']:>7.2f} | {r['qps']:>4.1f} | "
+              f"{r['dedup_s']:>8.3f} | {r['comparisons']}")
+
+
+if __name__ == "__main__":
+    main()
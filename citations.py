@@ -0,0 +1,69 @@
+import re
+from types import SimpleNamespace
+
+# 본문 인용 표기: [#17], [#17, #18] (링크는 생성 후 자동 연결)
+CITATION_RE = re.compile(r"\[#(\d+(?:\s*,\s*#?\d+)*)\]")
+_ID_RE = re.compile(r"\d+")
+
+
+def iter_numbered(news_data):
+    """
+    Yields (category, article id, item, [(related id, related item), ...]) in prompt order.
+    Ids run across all categories; related articles take the ids right after their representative.
+    """
+    article_id = 1
+    for cat, items in news_data.items():
+        for item in items:
+            related = [(article_id + n, rel) for n, rel in enumerate(item.get("related", []), 1)]
+            yield cat, article_id, item, related
+            article_id += 1 + len(related)
+
+
+def citation_links(news_data):
+    """
+    Returns {article id: link} for every article and related article in the prompt.
+    """
+    links = {}
+    for _, article_id, item, related in iter_numbered(news_data):
+        links[article_id] = item["link"]
+        for rel_id, rel in related:
+            links[rel_id] = rel["link"]
+    return links
+
+
+def expand_citations(text, links):
+    """
+    Replaces [#N] markers with <sup><a href=...>[N]</a></sup>. Returns (text, unknown ids); an unknown id is
+    left visible as [N?] so it can be spotted in the report.
+    """
+    unknown = []
+
+    def replace(match):
+        parts = []
+        for article_id in map(int, _ID_RE.findall(match.group(1))):
+            link = links.get(article_id)
+            if link is None:
+                unknown.append(article_id)
+                parts.append(f"<sup>[{article_id}?]</sup>")
+            else:
+                href = link.replace('"', "%22")
+                parts.append(f'<sup><a href="{href}" target="_blank">[{article_id}]</a></sup>')
+        return "".join(parts)
+
+    return CITATION_RE.sub(replace, text), unknown
+
+
+class CitedChat:
+    """
+    Chat session whose replies have their [#N] markers expanded like the report, using the ids of the
+    article list the session was started with. Replies keep the raw response as 'response'.
+    """
+
+    def __init__(self, chat, links):
+        self.chat = chat
+        self.links = links
+
+    def send_message(self, message):
+        response = self.chat.send_message(message)
+        text, unknown = expand_citations(response.text or "", self.links)
+        return SimpleNamespace(text=text, unknown=unknown, response=response)
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+# 만료 직전 캐시를 재사용하지 않기 위한 여유 시간 (초)
+EXPIRY_MARGIN = 120
+
+
+class GeminiCacheBackend:
+    """
+    Explicit context caching through the Gemini caches API (via llm_backend).
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def create(self, model, system_instruction, files, ttl):
+        from google.genai import types
+
+        config = types.CreateCachedContentConfig(
+            display_name="report-static-prefix",
+            system_instruction=system_instruction,
+            contents=list(files) or None,
+            ttl=f"{int(ttl)}s"
+        )
+        cache = self.backend.create_cache(model=model, config=config)
+        expire_time = getattr(cache, "expire_time", None)
+        expires_at = expire_time.timestamp() if isinstance(expire_time, datetime) else time.time() + ttl
+        return cache.name, expires_at
+
+    def exists(self, name):
+        try:
+            self.backend.get_cache(name=name)
+            return True
+        except Exception:
+            return False
+
+
+class LocalCacheBackend:
+    """
+    In-memory stand-in for the caches API (tests and offline runs).
+    """
+
+    def __init__(self):
+        self.caches = {}
+        self._counter = 0
+
+    def create(self, model, system_instruction, files, ttl):
+        self._counter += 1
+        name = f"cachedContents/local-{self._counter}"
+        expires_at = time.time() + ttl
+        self.caches[name] = {"model": model, "system_instruction": system_instruction,
+                             "files": list(files), "expires_at": expires_at}
+        return name, expires_at
+
+    def exists(self, name):
+        entry = self.caches.get(name)
+        return entry is not None and entry["expires_at"] > time.time()
+
+
+class ContextCache:
+    """
+    Registers the stable prompt prefix (static instructions + minutes excerpts or files) as cached content
+    once, and hands out its name for later generate_content / chat calls and reruns.
+    Cache names are kept in a small local registry keyed by a fingerprint of model, prefix text and files.
+    """
+
+    def __init__(self, backend, registry_path=".cache/context_caches.json", ttl=3600, min_chars=8000):
+        self.backend = backend
+        self.registry_path = registry_path
+        self.ttl = ttl
+        # 캐시 최소 토큰 요건에 못 미칠 만큼 짧은 프리픽스는 캐시하지 않음
+        self.min_chars = min_chars
+        self.stats = {"hits": 0, "misses": 0, "errors": 0, "skipped": 0, "invalidated": 0}
+        self._lock = threading.Lock()
+        self.entries = {}
+        if registry_path and os.path.exists(registry_path):
+            try:
+                with open(registry_path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error reading context cache registry {registry_path}: {e}")
+
+    @staticmethod
+    def fingerprint(model, static_prompt, files):
+        digest = hashlib.sha256()
+        digest.update(model.encode("utf-8"))
+        digest.update(static_prompt.encode("utf-8"))
+        for f in files:
+            digest.update(str(getattr(f, "uri", None) or getattr(f, "name", f)).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_or_create(self, model, static_prompt, files=()):
+        """
+        Returns the cached content name for this prefix, creating it on a miss. None if caching is not possible.
+        """
+        files = list(files)
+        if not files and len(static_prompt) < self.min_chars:
+            self.stats["skipped"] += 1
+            return None
+
+        key = self.fingerprint(model, static_prompt, files)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry["expires_at"] - EXPIRY_MARGIN > time.time() and self.backend.exists(entry["name"]):
+                self.stats["hits"] += 1
+                return entry["name"]
+
+            self.stats["misses"] += 1
+            try:
+                name, expires_at = self.backend.create(model, static_prompt, files, self.ttl)
+            except Exception as e:
+                print(f"   - 컨텍스트 캐시 생성 실패 (캐시 없이 진행): {e}")
+                self.stats["errors"] += 1
+                return None
+            self.entries[key] = {"name": name, "expires_at": expires_at}
+            self._save()
+            return name
+
+    def invalidate(self, model, static_prompt, files=()):
+        """
+        Forgets the cache for this prefix (e.g. a call on it failed), so the next get_or_create recreates it.
+        """
+        key = self.fingerprint(model, static_prompt, list(files))
+        with self._lock:
+            if self.entries.pop(key, None) is not None:
+                self.stats["invalidated"] += 1
+                self._save()
+
+    def _save(self):
+        if not self.registry_path:
+            return
+        now = time.time()
+        self.entries = {k: v for k, v in self.entries.items() if v["expires_at"] > now}
+        os.makedirs(os.path.dirname(self.registry_path) or ".", exist_ok=True)
+        tmp_path = self.registry_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.registry_path)
+
+    def summary(self):
+        return (f"context cache hit {self.stats['hits']} / miss {self.stats['misses']}, "
+                f"errors {self.stats['errors']}, skipped {self.stats['skipped']}, "
+                f"invalidated {self.stats['invalidated']}")
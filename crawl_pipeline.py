@@ -0,0 +1,216 @@
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+
+from noise_filter import clean_text
+
+
+class Stage:
+    """
+    A generator stage of the crawl pipeline.
+    Subclasses override process(article), returning the (possibly updated) article or None to drop it.
+    """
+
+    name = "stage"
+
+    def __init__(self):
+        self.passed = 0
+        self.dropped = 0
+        # process()에 소요된 누적 시간 (초)
+        self.elapsed = 0.0
+        # 쿼리별 통과/제외 건수 (쿼리 수율 분석용)
+        self.passed_by_query = Counter()
+        self.dropped_by_query = Counter()
+
+    def process(self, article):
+        return article
+
+    def __call__(self, stream):
+        for article in stream:
+            started = time.perf_counter()
+            result = self.process(article)
+            self.elapsed += time.perf_counter() - started
+            if result is None:
+                self.dropped += 1
+                self.dropped_by_query[article.get("query")] += 1
+                continue
+            self.passed += 1
+            self.passed_by_query[article.get("query")] += 1
+            yield result
+
+
+class NormalizeStage(Stage):
+    """
+    Turns a raw Naver item into an article dict: cleaned title/description, canonical link, pubDate timestamp.
+    """
+
+    name = "normalize"
+
+    def __init__(self, state=None):
+        super().__init__()
+        self.state = state
+
+    def process(self, article):
+        item = article["item"]
+        article["link"] = item.get("originallink", item.get("link", ""))
+        # <b> 태그/HTML 엔티티 제거 (정제된 텍스트를 프롬프트까지 그대로 사용)
+        article["title"] = clean_text(item.get("title", ""))
+        article["description"] = clean_text(item.get("description", ""))
+        article["pub_ts"] = None
+        article["pub_error"] = False
+        pub_date_str = item.get("pubDate")
+        if pub_date_str:
+            try:
+                article["pub_ts"] = parsedate_to_datetime(pub_date_str).timestamp()
+            except (TypeError, ValueError):
+                article["pub_error"] = True
+        if self.state is not None and article["pub_ts"] is not None:
+            self.state.update_high_water(article["query"], article["pub_ts"])
+        return article
+
+
+class NoiseStage(Stage):
+    """
+    Drops promotional/event articles (keyword match on title or description).
+    """
+
+    name = "noise"
+
+    def __init__(self, noise_filter):
+        super().__init__()
+        self.noise_filter = noise_filter
+
+    def process(self, article):
+        if self.noise_filter.search(article["title"], article["description"]):
+            return None
+        return article
+
+
+class DateWindowStage(Stage):
+    """
+    Drops articles published before the crawl window. Articles whose pubDate cannot be parsed are dropped too.
+    """
+
+    name = "window"
+
+    def __init__(self, now, hours_limit):
+        super().__init__()
+        self.cutoff = now.timestamp() - hours_limit * 3600
+
+    def process(self, article):
+        if article["pub_error"]:
+            return None
+        if article["pub_ts"] is not None and article["pub_ts"] < self.cutoff:
+            return None
+        return article
+
+
+class UrlDedupStage(Stage):
+    """
+    Drops articles whose link was already accepted in this run.
+    """
+
+    name = "url_dedup"
+
+    def __init__(self, seen_links):
+        super().__init__()
+        self.seen_links = seen_links
+
+    def process(self, article):
+        if article["link"] in self.seen_links:
+            return None
+        return article
+
+
+class IncrementalStage(Stage):
+    """
+    Marks articles already processed by a previous run; drops them in incremental mode.
+    """
+
+    name = "incremental"
+
+    def __init__(self, state, incremental=False):
+        super().__init__()
+        self.state = state
+        self.incremental = incremental
+
+    def process(self, article):
+        article["is_new"] = self.state is None or not self.state.is_seen(article["link"], article["title"])
+        if self.incremental and not article["is_new"]:
+            return None
+        return article
+
+
+class NearDupStage(Stage):
+    """
+    Drops articles whose title is a near-duplicate of an accepted one.
+    This is the last filter, so it also records accepted links/titles (and the persistent crawl state).
+    """
+
+    name = "near_dup"
+
+    def __init__(self, title_index, seen_links, state=None):
+        super().__init__()
+        self.title_index = title_index
+        self.seen_links = seen_links
+        self.state = state
+
+    def process(self, article):
+        if self.title_index.is_duplicate(article["title"]):
+            return None
+        self.seen_links.add(article["link"])
+        self.title_index.add(article["title"])
+        if self.state is not None:
+            self.state.mark(article["link"], article["title"], article["pub_ts"])
+        return article
+
+
+class CrawlPipeline:
+    """
+    Chains generator stages: articles flow one at a time from the fetch source to the consumer,
+    so downstream work starts while later queries are still being fetched.
+    """
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+
+    def stage(self, name):
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+        raise KeyError(name)
+
+    def insert_after(self, name, stage):
+        self.stages.insert(self.stages.index(self.stage(name)) + 1, stage)
+
+    def replace(self, name, stage):
+        self.stages[self.stages.index(self.stage(name))] = stage
+
+    def run(self, source):
+        stream = source
+        for stage in self.stages:
+            stream = stage(stream)
+        return stream
+
+    def report(self):
+        return [(stage.name, stage.passed, stage.dropped) for stage in self.stages]
+
+    def summary(self):
+        return ", ".join(f"{name} {passed}/-{dropped}" for name, passed, dropped in self.report())
+
+
+def categorize(articles, categories):
+    """
+    Collects accepted articles into {category: [item, ...]} in the configured category order.
+    """
+    result = {cat: [] for cat in categories}
+    for article in articles:
+        result[article["category"]].append({
+            "title": article["title"],
+            "description": article["description"],
+            "link": article["link"],
+            "query": article["query"],
+            "is_new": article.get("is_new", True),
+            "pub_ts": article.get("pub_ts")
+        })
+    return result
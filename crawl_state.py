@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import re
+import time
+
+_NORMALIZE_RE = re.compile(r"[\W_]+")
+
+
+class CrawlState:
+    """
+    Crawl state persisted between daily runs.
+    Keeps processed links, title fingerprints and per-query high-water marks (latest pubDate seen),
+    all as dicts for O(1) membership. Entries older than the crawl window are expired on save.
+    """
+
+    def __init__(self, path=".cache/crawl_state.json", hours_limit=72):
+        self.path = path
+        self.hours_limit = hours_limit
+        self.links = {}
+        self.fingerprints = {}
+        self.high_water = {}
+        self.last_run = None
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading crawl state {self.path}: {e}")
+            return
+        self.links = data.get("links", {})
+        self.fingerprints = data.get("fingerprints", {})
+        self.high_water = data.get("high_water", {})
+        self.last_run = data.get("last_run")
+
+    @staticmethod
+    def fingerprint(title):
+        normalized = _NORMALIZE_RE.sub("", title).lower()
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+    def has_link(self, link):
+        return link in self.links
+
+    def has_title(self, title):
+        return self.fingerprint(title) in self.fingerprints
+
+    def is_seen(self, link, title):
+        return self.has_link(link) or self.has_title(title)
+
+    def mark(self, link, title, timestamp=None):
+        """
+        Records a processed article. 'timestamp' is its pubDate (epoch seconds) when known.
+        """
+        ts = timestamp if timestamp is not None else time.time()
+        self.links.setdefault(link, ts)
+        self.fingerprints.setdefault(self.fingerprint(title), ts)
+
+    def high_water_mark(self, query):
+        """
+        Returns the newest pubDate (epoch seconds) seen for 'query' in a previous run, or None.
+        """
+        return self.high_water.get(query)
+
+    def update_high_water(self, query, timestamp):
+        if timestamp > self.high_water.get(query, 0):
+            self.high_water[query] = timestamp
+
+    def expire(self, now=None):
+        """
+        Drops entries that fall outside the crawl window.
+        """
+        cutoff = (now or time.time()) - self.hours_limit * 3600
+        self.links = {k: v for k, v in self.links.items() if v >= cutoff}
+        self.fingerprints = {k: v for k, v in self.fingerprints.items() if v >= cutoff}
+        self.high_water = {k: v for k, v in self.high_water.items() if v >= cutoff}
+
+    def save(self):
+        self.expire()
+        self.last_run = time.time()
+        data = {
+            "last_run": self.last_run,
+            "links": self.links,
+            "fingerprints": self.fingerprints,
+            "high_water": self.high_water
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,404 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+# 재시도 대상 HTTP 상태 코드
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+def _status_code(error):
+    for attr in ("code", "status_code"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def _retry_after(error):
+    """
+    Seconds from a Retry-After header on the failed response, if the server sent one.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def is_retryable(error):
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRY_STATUS
+    # 상태 코드가 없는 네트워크 계열 오류 (타임아웃, 연결 끊김)
+    name = type(error).__name__.lower()
+    return isinstance(error, (TimeoutError, ConnectionError)) or "timeout" in name or "connect" in name
+
+
+class GeminiBackend:
+    """
+    Thin layer over genai.Client used by LLMProcessor: per-request timeout, a concurrency limit, and
+    retries on 429/5xx/network errors with exponential backoff that honors Retry-After and never sleeps
+    past the call's overall deadline.
+    """
+
+    def __init__(self, client, max_retries=4, deadline=900, base_delay=2.0, max_delay=60.0, max_concurrency=4):
+        self.client = client
+        self.max_retries = max_retries
+        self.deadline = deadline
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self.stats = {"calls": 0, "retries": 0, "failures": 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        from google import genai
+
+        timeout = float(os.getenv("LLM_TIMEOUT", 600))
+        client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"),
+                              http_options={"timeout": int(timeout * 1000)})
+        return cls(
+            client,
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", 4)),
+            deadline=float(os.getenv("LLM_DEADLINE", 900)),
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", 4))
+        )
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _retrying(self, label, fn):
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            self._count("calls")
+            try:
+                return fn()
+            except Exception as e:
+                remaining = self.deadline - (time.monotonic() - started)
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = min(self.max_delay, self.base_delay * (2 ** attempt)) * random.uniform(0.5, 1.0)
+                if not is_retryable(e) or attempt >= self.max_retries or delay >= remaining:
+                    self._count("failures")
+                    raise
+                attempt += 1
+                self._count("retries")
+                print(f"   - {label} 재시도 {attempt}/{self.max_retries} ({delay:.1f}s 후): {e}")
+                time.sleep(delay)
+
+    def _call(self, label, fn, **kwargs):
+        def limited():
+            # 대기(backoff) 중에는 슬롯을 반납하도록 시도 단위로 점유
+            with self._slots:
+                return fn(**kwargs)
+        return self._retrying(label, limited)
+
+    def generate(self, model, contents, config=None):
+        return self._call("generate_content", self.client.models.generate_content,
+                          model=model, contents=contents, config=config)
+
+    def generate_stream(self, model, contents, config=None):
+        """
+        Streams chunks. Opening the stream (up to the first chunk) is retried; once chunks have arrived,
+        errors propagate and the caller's checkpoint takes over.
+        """
+        def start():
+            # 시도마다 슬롯을 점유하고 실패 시 바로 반납 (backoff 대기 중에는 슬롯을 잡지 않음)
+            self._slots.acquire()
+            try:
+                iterator = iter(self.client.models.generate_content_stream(model=model, contents=contents,
+                                                                           config=config))
+                return iterator, next(iterator, None)
+            except BaseException:
+                self._slots.release()
+                raise
+
+        iterator, first = self._retrying("generate_content_stream", start)
+        # 열린 스트림은 끝까지 읽을 때(또는 소비자가 닫을 때)까지 슬롯 유지
+        try:
+            if first is None:
+                return
+            yield first
+            yield from iterator
+        finally:
+            self._slots.release()
+
+    def upload(self, file, config=None):
+        def rewind_and_upload(**kwargs):
+            # 재시도 시 처음부터 다시 전송
+            if hasattr(file, "seek"):
+                file.seek(0)
+            return self.client.files.upload(**kwargs)
+        return self._call("files.upload", rewind_and_upload, file=file, config=config)
+
+    def get_file(self, name):
+        return self._call("files.get", self.client.files.get, name=name)
+
+    def create_cache(self, model, config):
+        return self._call("caches.create", self.client.caches.create, model=model, config=config)
+
+    def get_cache(self, name):
+        return self._call("caches.get", self.client.caches.get, name=name)
+
+    def create_chat(self, model, config=None, history=None):
+        return _GeminiChat(self, self.client.chats.create(model=model, config=config, history=history))
+
+    def summary(self):
+        return f"LLM 호출 {self.stats['calls']}회, 재시도 {self.stats['retries']}회, 실패 {self.stats['failures']}회"
+
+
+class _GeminiChat:
+    """
+    Chat turns go through the backend like every other call (concurrency limit, retries, stats).
+    """
+
+    def __init__(self, backend, chat):
+        self.backend = backend
+        self.chat = chat
+
+    def send_message(self, message):
+        return self.backend._call("chats.send_message", self.chat.send_message, message=message)
+
+
+def _normalize(value):
+    """
+    Stable, run-independent description of request contents for record/replay keys: text as is,
+    uploaded files by display name (remote names change on every upload), chat turns by their text.
+    """
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, str):
+        return value
+    if getattr(value, "parts", None) is not None:
+        return [getattr(value, "role", None)] + [getattr(part, "text", None) for part in value.parts]
+    display_name = getattr(value, "display_name", None) or getattr(value, "name", None)
+    return f"file:{display_name}"
+
+
+def prefix_digest(model, config):
+    """
+    Stable description of a cached prefix (its instructions and files), unlike the remote cache name.
+    """
+    raw = json.dumps([model, getattr(config, "system_instruction", None),
+                      _normalize(getattr(config, "contents", None) or [])], ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def record_key(kind, model, contents, config=None, prefix=None):
+    """
+    'prefix' is the prefix_digest() of the cached content the call runs on, if any.
+    """
+    system_instruction = getattr(config, "system_instruction", None)
+    parts = [kind, model, _normalize(contents), system_instruction]
+    if prefix is not None:
+        parts.append(prefix)
+    raw = json.dumps(parts, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _PrefixRegistry:
+    """
+    Remote cache name -> prefix_digest() for caches created through a recording/replay backend.
+    Caches it did not create are reported as missing, so ContextCache recreates them and every cached
+    call can be keyed by its prefix content.
+    """
+
+    def __init__(self):
+        self.prefixes = {}
+
+    def add(self, name, model, config):
+        self.prefixes[name] = prefix_digest(model, config)
+
+    def check(self, name):
+        if name not in self.prefixes:
+            raise KeyError(f"녹화/재생 중 생성되지 않은 컨텍스트 캐시입니다: {name}")
+
+    def of(self, config):
+        name = getattr(config, "cached_content", None)
+        return self.prefixes.get(name, name) if name else None
+
+
+class RecordingBackend:
+    """
+    Wraps a live backend and stores every generation (text, latency and stream chunk timing) under
+    'record_dir', keyed by record_key(), for later offline replay.
+    """
+
+    def __init__(self, inner, record_dir=".cache/llm_records"):
+        self.inner = inner
+        self.record_dir = record_dir
+        self.caches = _PrefixRegistry()
+        os.makedirs(record_dir, exist_ok=True)
+
+    def _save(self, key, entry):
+        path = os.path.join(self.record_dir, f"{key}.json")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def generate(self, model, contents, config=None):
+        started = time.monotonic()
+        response = self.inner.generate(model, contents, config)
+        self._save(record_key("generate", model, contents, config, self.caches.of(config)),
+                   {"latency": time.monotonic() - started, "text": response.text})
+        return response
+
+    def generate_stream(self, model, contents, config=None):
+        chunks = []
+        last = time.monotonic()
+        for chunk in self.inner.generate_stream(model, contents, config):
+            now = time.monotonic()
+            chunks.append([now - last, getattr(chunk, "text", None) or ""])
+            last = now
+            yield chunk
+        self._save(record_key("stream", model, contents, config, self.caches.of(config)), {"chunks": chunks})
+
+    def upload(self, file, config=None):
+        return self.inner.upload(file, config)
+
+    def get_file(self, name):
+        return self.inner.get_file(name)
+
+    def create_cache(self, model, config):
+        cache = self.inner.create_cache(model, config)
+        self.caches.add(cache.name, model, config)
+        return cache
+
+    def get_cache(self, name):
+        self.caches.check(name)
+        return self.inner.get_cache(name)
+
+    def create_chat(self, model, config=None, history=None):
+        return _RecordingChat(self, self.inner.create_chat(model, config, history), model, config, history)
+
+    def summary(self):
+        return self.inner.summary()
+
+
+def _chat_turns(backend, model, config, history):
+    turns = [model, _normalize(history or []), getattr(config, "system_instruction", None)]
+    prefix = backend.caches.of(config)
+    if prefix is not None:
+        turns.append(prefix)
+    return turns
+
+
+class _RecordingChat:
+    def __init__(self, backend, chat, model, config, history):
+        self.backend = backend
+        self.chat = chat
+        self.turns = _chat_turns(backend, model, config, history)
+
+    def send_message(self, message):
+        started = time.monotonic()
+        response = self.chat.send_message(message)
+        self.turns.append(_normalize(message))
+        self.backend._save(record_key("chat", self.turns[0], self.turns[1:]),
+                           {"latency": time.monotonic() - started, "text": response.text})
+        self.turns.append(response.text)
+        return response
+
+
+class ReplayBackend:
+    """
+    Serves recorded generations from disk without touching the network. Recorded latencies (and stream
+    chunk timing) are reproduced, scaled by 'latency_scale' (0 = instant). Uploads, files and caches are
+    simulated as immediately ACTIVE.
+    """
+
+    def __init__(self, record_dir=".cache/llm_records", latency_scale=1.0):
+        self.record_dir = record_dir
+        self.latency_scale = latency_scale
+        self.caches = _PrefixRegistry()
+        self.stats = {"calls": 0, "retries": 0, "failures": 0}
+
+    def _load(self, key):
+        self.stats["calls"] += 1
+        path = os.path.join(self.record_dir, f"{key}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            self.stats["failures"] += 1
+            raise KeyError(f"녹화된 응답이 없습니다: {path}")
+
+    def _wait(self, seconds):
+        if self.latency_scale > 0 and seconds > 0:
+            time.sleep(seconds * self.latency_scale)
+
+    def generate(self, model, contents, config=None):
+        entry = self._load(record_key("generate", model, contents, config, self.caches.of(config)))
+        self._wait(entry.get("latency", 0))
+        return SimpleNamespace(text=entry["text"])
+
+    def generate_stream(self, model, contents, config=None):
+        entry = self._load(record_key("stream", model, contents, config, self.caches.of(config)))
+        for delay, text in entry["chunks"]:
+            self._wait(delay)
+            yield SimpleNamespace(text=text)
+
+    @staticmethod
+    def _file(name, display_name=None):
+        return SimpleNamespace(name=name, display_name=display_name, uri=f"replay://{name}",
+                               state=SimpleNamespace(name="ACTIVE"), expiration_time=None)
+
+    def upload(self, file, config=None):
+        display_name = (config or {}).get("display_name") or os.path.basename(getattr(file, "name", str(file)))
+        digest = hashlib.sha256(display_name.encode("utf-8")).hexdigest()[:16]
+        return self._file(f"files/replay-{digest}", display_name)
+
+    def get_file(self, name):
+        return self._file(name)
+
+    def create_cache(self, model, config):
+        name = f"cachedContents/replay-{prefix_digest(model, config)[:16]}"
+        self.caches.add(name, model, config)
+        return SimpleNamespace(name=name, expire_time=None)
+
+    def get_cache(self, name):
+        self.caches.check(name)
+        return SimpleNamespace(name=name)
+
+    def create_chat(self, model, config=None, history=None):
+        return _ReplayChat(self, model, config, history)
+
+    def summary(self):
+        return f"녹화 응답 재생 {self.stats['calls']}회, 누락 {self.stats['failures']}회"
+
+
+class _ReplayChat:
+    def __init__(self, backend, model, config, history):
+        self.backend = backend
+        self.turns = _chat_turns(backend, model, config, history)
+
+    def send_message(self, message):
+        self.turns.append(_normalize(message))
+        entry = self.backend._load(record_key("chat", self.turns[0], self.turns[1:]))
+        self.backend._wait(entry.get("latency", 0))
+        self.turns.append(entry["text"])
+        return SimpleNamespace(text=entry["text"])
+
+
+def backend_from_env():
+    """
+    LLM_BACKEND=live (default) | record | replay.
+    """
+    mode = os.getenv("LLM_BACKEND", "live")
+    record_dir = os.getenv("LLM_RECORD_DIR", ".cache/llm_records")
+    if mode == "replay":
+        return ReplayBackend(record_dir, latency_scale=float(os.getenv("LLM_REPLAY_LATENCY_SCALE", 1.0)))
+    backend = GeminiBackend.from_env()
+    if mode == "record":
+        return RecordingBackend(backend, record_dir)
+    return backend
@@ -0,0 +1,125 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class LLMResponseCache:
+    """
+    On-disk cache of generated reports, keyed by model name, prompt hash and the hashes of attached files.
+
+    Modes:
+      - "write": write-through. Hits are served from disk, fresh generations are stored.
+      - "read":  read-only. Hits are served, nothing new is stored.
+      - "off":   bypass.
+    Entries older than 'max_age' are ignored and removed; the oldest entries are evicted once 'max_bytes'
+    is exceeded.
+    """
+
+    MODES = ("write", "read", "off")
+
+    def __init__(self, cache_dir=".cache/llm", max_age=7 * 24 * 3600, max_bytes=100 * 1024 * 1024, mode="write"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown cache mode: {mode} (expected one of {self.MODES})")
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        if self.mode != "off":
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            cache_dir=os.getenv("LLM_CACHE_DIR", ".cache/llm"),
+            max_age=float(os.getenv("LLM_CACHE_MAX_AGE_HOURS", 168)) * 3600,
+            max_bytes=int(os.getenv("LLM_CACHE_MAX_MB", 100)) * 1024 * 1024,
+            mode=os.getenv("LLM_CACHE_MODE", "write")
+        )
+
+    @staticmethod
+    def key(model, prompt, file_hashes=()):
+        prompt_digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        raw = json.dumps([model, prompt_digest, sorted(file_hashes)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json.gz")
+
+    def get(self, key):
+        """
+        Returns the cached response text for 'key', or None on a miss.
+        """
+        if self.mode == "off":
+            return None
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+        if time.time() - entry.get("stored_at", 0) > self.max_age:
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+        with self._lock:
+            self.stats["hits"] += 1
+        return entry.get("text")
+
+    def put(self, key, text, model=None, file_hashes=()):
+        if self.mode != "write" or not text:
+            return
+        path = self._path(key)
+        entry = {"model": model, "files": sorted(file_hashes), "stored_at": time.time(), "text": text}
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.stats["stores"] += 1
+        self.evict()
+
+    def evict(self):
+        """
+        Removes entries past 'max_age', then the oldest ones until the cache fits in 'max_bytes'.
+        """
+        with self._lock:
+            now = time.time()
+            entries = []
+            total = 0
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".json.gz"):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if now - st.st_mtime > self.max_age:
+                    self._remove(path)
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            self.stats["evictions"] += 1
+        except OSError:
+            pass
+
+    def summary(self):
+        return (f"LLM cache[{self.mode}] hit {self.stats['hits']} / miss {self.stats['misses']}, "
+                f"stored {self.stats['stores']}, evicted {self.stats['evictions']}")
@@ -1,26 +1,109 @@
 import os
-from google import genai
 from dotenv import load_dotenv
 
+from citations import CitedChat, citation_links, expand_citations
+from context_cache import ContextCache, GeminiCacheBackend
+from llm_backend import backend_from_env
+from llm_cache import LLMResponseCache
+from prompt_packer import PromptPacker, estimate_tokens
+from upload_cache import UploadCache
+
 load_dotenv()
 
 class LLMProcessor:
     def __init__(self):
-        self.client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+        # Gemini 호출 계층 (타임아웃/재시도/동시성 제한, LLM_BACKEND=record|replay 로 녹화/재생)
+        self.backend = backend_from_env()
         # 의원님께서 결제 설정을 완료하셨으므로 가용한 가장 강력한 Pro 모델을 유지합니다.
         self.model_name = 'gemini-2.5-pro' 
+        # 업로드한 회의록 PDF 재사용 캐시 (SHA-256 -> 원격 파일)
+        self.upload_cache = UploadCache()
+        # 업로드된 파일 이름 -> 로컬 PDF SHA-256 (응답 캐시 키에 사용)
+        self.file_digests = {}
+        # 동일 프롬프트/첨부 파일에 대한 생성 결과 캐시 (LLM_CACHE_MODE=write|read|off)
+        self.response_cache = LLMResponseCache.from_env()
+        # 회의록 업로드/상태 조회 동시 작업 수, 파일 처리 대기 최대 시간(초)
+        self.upload_workers = int(os.getenv("UPLOAD_WORKERS", 4))
+        self.processing_timeout = float(os.getenv("UPLOAD_PROCESSING_TIMEOUT", 300))
+        # 회의록 활용 방식: retrieval(기사 주제 기반 페이지 검색) | upload(최근 10개 PDF 업로드)
+        self.minutes_mode = os.getenv("MINUTES_MODE", "retrieval")
+        self.minutes_char_budget = int(os.getenv("MINUTES_CHAR_BUDGET", 40000))
+        # 정적 프롬프트(+회의록 파일) 컨텍스트 캐시 (CONTEXT_CACHE=0 이면 비활성화)
+        self.context_cache = None
+        if os.getenv("CONTEXT_CACHE", "1").lower() not in ("0", "false", "no"):
+            self.context_cache = ContextCache(GeminiCacheBackend(self.backend),
+                                              ttl=int(os.getenv("CONTEXT_CACHE_TTL", 3600)))
+        # 입력 토큰 예산 (정적 지침 + 이력 + 회의록 발췌 + 기사 전체 기준)
+        self.prompt_token_budget = int(os.getenv("PROMPT_TOKEN_BUDGET", 150000))
+        # 같은 사건을 다룬 기사를 대표 기사 1건 + 관련 링크로 묶음 (ARTICLE_CLUSTERING=0 이면 비활성화)
+        self.article_clustering = os.getenv("ARTICLE_CLUSTERING", "1").lower() not in ("0", "false", "no")
+        self.cluster_threshold = float(os.getenv("CLUSTER_THRESHOLD", 0.45))
+        # 보고서 생성 방식: single(한 번에 생성) | mapreduce(바스켓별 병렬 분석 후 통합)
+        self.report_mode = os.getenv("REPORT_MODE", "single")
+        self.map_concurrency = int(os.getenv("MAP_CONCURRENCY", 3))
+        self.map_candidates = int(os.getenv("MAP_CANDIDATES", 6))
+        # 스트리밍 생성 + 체크포인트 (중단 시 완료된 이슈 이후부터 이어서 생성)
+        self.stream_report = os.getenv("REPORT_STREAM", "1").lower() not in ("0", "false", "no")
 
     def generate_report(self, news_data, previous_reports=None):
-        import glob
-        import time
-        
-        # 1. 회의록 PDF 업로드 및 처리
-        # minutes/회의록 및 minutes/국정감사 폴더 내의 PDF 파일 탐색
-        pdf_files = glob.glob("minutes/회의록/*.pdf") + glob.glob("minutes/회의록/*.PDF") + \
-                    glob.glob("minutes/국정감사/*.pdf") + glob.glob("minutes/국정감사/*.PDF")
+        # 1. 기사 묶음 + 회의록(발췌 또는 PDF 업로드) + 정적 프롬프트 프리픽스
+        news_data, static_prompt, uploaded_files = self._prepare_context(news_data)
+        news_data, previous_reports = self._pack_inputs(news_data, previous_reports,
+                                                        fixed_text=static_prompt + self._build_dynamic_prompt({}))
+        dynamic_prompt = self._build_dynamic_prompt(news_data, previous_reports=previous_reports)
+
+        # 기사 번호 -> 원문 링크 (프롬프트에는 번호만 들어가므로 캐시 키에도 포함)
+        links = citation_links(news_data)
+
+        # 프롬프트와 첨부 파일이 동일하면 이전 생성 결과 재사용
+        file_hashes = [self.file_digests.get(f.name, f.name) for f in uploaded_files]
+        cache_key = self.response_cache.key(self.model_name,
+                                            f"{self.report_mode}\0{static_prompt}{dynamic_prompt}\0{sorted(links.items())}",
+                                            file_hashes)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            print(f"⚡ 동일한 입력의 보고서를 캐시에서 불러왔습니다. ({self.response_cache.summary()})")
+            return cached
+
+        if self.report_mode == "mapreduce":
+            text = self._generate_map_reduce(static_prompt, news_data, previous_reports, uploaded_files)
+        elif self.stream_report:
+            text = self._generate_streaming(static_prompt, dynamic_prompt, uploaded_files)
+        else:
+            text = self._generate(static_prompt, dynamic_prompt, uploaded_files).text
+
+        text, unknown = expand_citations(text, links)
+        if unknown:
+            print(f"   - ⚠️ 목록에 없는 기사 번호 인용 {len(unknown)}건: {sorted(set(unknown))[:20]}")
+
+        self.response_cache.put(cache_key, text, model=self.model_name, file_hashes=file_hashes)
+        if self.response_cache.mode != "off":
+            print(f"   - {self.response_cache.summary()}")
+        print(f"   - {self.backend.summary()}")
+        return text
+
+    def _prepare_context(self, news_data):
+        """
+        Collapses same-event articles, gathers the minutes (retrieved excerpts, or uploaded PDFs as a fallback)
+        and builds the static prompt prefix. generate_report and create_chat_session both start here, so the
+        same articles give them the same prefix and files, and therefore the same context cache.
+        Returns (news_data, static_prompt, uploaded_files).
+        """
+        if self.article_clustering:
+            from article_clustering import ArticleClusterer
+
+            clusterer = ArticleClusterer(threshold=self.cluster_threshold)
+            news_data = clusterer.collapse_all(news_data)
+            print(f"🧩 사건 단위 기사 묶음: {clusterer.summary()}")
+
+        pdf_files = self._minutes_files()
         uploaded_files = []
-        
-        if pdf_files:
+        minutes_excerpts = None
+
+        if pdf_files and self.minutes_mode == "retrieval":
+            minutes_excerpts = self._retrieve_minutes(news_data)
+
+        if pdf_files and minutes_excerpts is None:
             # 날짜 기준 정렬 (파일명 끝의 (YYYY.MM.DD.) 추출)
             try:
                 pdf_files.sort(key=lambda x: x.split('(')[-1].split(')')[0], reverse=True)
@@ -30,67 +113,370 @@ class LLMProcessor:
             # 최근 10개만 선택
             target_files = pdf_files[:10]
             print(f"📄 전체 {len(pdf_files)}개 중 최근 {len(target_files)}개 회의록을 분석합니다.")
-            
-            for pdf in target_files:
-                try:
-                    # 파일 업로드 (한글 파일명 오류 방지를 위해 바이너리 모드로 읽기, MIME 타입 명시)
-                    with open(pdf, 'rb') as f:
-                        file_ref = self.client.files.upload(file=f, config={'mime_type': 'application/pdf', 'display_name': os.path.basename(pdf)})
-                    print(f"   - 업로드 완료: {os.path.basename(pdf)}")
-                    uploaded_files.append(file_ref)
-                except Exception as e:
-                    print(f"   - 업로드 실패 ({pdf}): {e}")
-
-            # 파일 처리 대기 (ACTIVE 상태 확인)
-            # Gemini 1.5 Pro는 문서 처리 시간이 필요할 수 있음
-            print("⏳ 파일 처리 대기 중...")
-            for f in uploaded_files:
-                while f.state.name == "PROCESSING":
-                    time.sleep(2)
-                    f = self.client.files.get(name=f.name)
-            print("✅ 모든 회의록 파일 준비 완료!")
-
-        prompt = self._build_prompt(news_data, has_minutes=len(uploaded_files) > 0, previous_reports=previous_reports)
-        
-        # 프롬프트 + 파일(있다면) 함께 전송
-        contents = [prompt]
-        if uploaded_files:
-            contents.extend(uploaded_files)
+            uploaded_files = self._prepare_minutes(target_files)
 
-        response = self.client.models.generate_content(
-            model=self.model_name,
-            contents=contents
+        attached_minutes = [getattr(f, "display_name", None) or f.name for f in uploaded_files]
+        static_prompt = self._build_static_prompt(has_minutes=bool(uploaded_files or minutes_excerpts),
+                                                  attached_minutes=attached_minutes,
+                                                  minutes_excerpts=minutes_excerpts)
+        return news_data, static_prompt, uploaded_files
+
+    @staticmethod
+    def _minutes_files():
+        import glob
+
+        # minutes/회의록 및 minutes/국정감사 폴더 내의 PDF 파일 탐색
+        return glob.glob("minutes/회의록/*.pdf") + glob.glob("minutes/회의록/*.PDF") + \
+            glob.glob("minutes/국정감사/*.pdf") + glob.glob("minutes/국정감사/*.PDF")
+
+    def _generate_streaming(self, static_prompt, dynamic_prompt, files):
+        """
+        Streams the report into latest_report.partial.md as chunks arrive. If a previous run with the same
+        prompt was interrupted, only the missing issues are requested and appended to the saved part.
+        """
+        from report_checkpoint import REPORT_ISSUES, ReportCheckpoint, completed_issues, prompt_hash
+
+        checkpoint = ReportCheckpoint()
+        names = [getattr(f, "name", str(f)) for f in files]
+        previous = checkpoint.resume(prompt_hash(self.model_name, static_prompt, dynamic_prompt, *names))
+        done = completed_issues(previous, final=True)
+        if done:
+            missing = [n for n in range(1, REPORT_ISSUES + 1) if n not in {num for num, _ in done}]
+            print(f"♻️ 이전 실행에서 {len(done)}개 이슈가 완료되어, 나머지 {len(missing)}개만 생성합니다.")
+            dynamic_prompt += f"""
+[이어서 작성 지침]
+- 이 보고서의 아래 이슈는 이미 작성되었습니다. 다시 작성하지 마십시오:
+{chr(10).join(f"  - [{num}]. {title}" for num, title in done)}
+- 시작 멘트 없이 **{", ".join(str(n) for n in missing)}번 이슈만** 같은 포맷(`### [N]. [이슈 제목]`)으로 작성하십시오.
+"""
+
+        print("✍️ 보고서 스트리밍 생성 중...")
+        try:
+            for chunk in self._generate(static_prompt, dynamic_prompt, files, stream=True):
+                checkpoint.append(getattr(chunk, "text", None) or "")
+        except BaseException:
+            checkpoint.close()
+            print(f"   - 생성 중단: 작성된 부분은 '{checkpoint.path}'에 보존되어 다음 실행에서 이어집니다.")
+            raise
+        return checkpoint.finish()
+
+    def _generate_map_reduce(self, static_prompt, news_data, previous_reports, files):
+        """
+        Map: every basket is analyzed concurrently on its own articles and returns candidate issues.
+        Reduce: one final call ranks and merges the candidates into the 1~5 / 6~20 report.
+        Article numbers are global, so citations survive the merge unchanged.
+        """
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        shards = [cat for cat, items in news_data.items() if items]
+        map_task = f"""
+[후보 이슈 분석 단계]
+- 이번 단계에서는 전체 보고서가 아니라, 위 섹션의 기사만으로 **후보 이슈를 최대 {self.map_candidates}개** 작성합니다.
+- 시작 멘트 없이 각 후보를 `### [후보]. [이슈 제목]` 으로 시작하고, 보고서 포맷의 나머지 항목을 그대로 작성하십시오.
+- 근거 표기는 위 목록의 기사 번호([#N])를 **그대로** 사용하십시오. (번호를 새로 매기지 마십시오)
+- 중요도가 높은 순서로 나열하십시오.
+"""
+
+        def run_shard(cat):
+            prompt = self._build_dynamic_prompt(news_data, previous_reports=previous_reports, categories=[cat],
+                                                closing=map_task)
+            return self._generate_text(f"map:{cat}", static_prompt, prompt, files)
+
+        started = time.time()
+        print(f"🗺️ 바스켓별 병렬 분석: {len(shards)}개 (동시 {self.map_concurrency}개)")
+        with ThreadPoolExecutor(max_workers=max(1, min(self.map_concurrency, len(shards)))) as executor:
+            results = list(executor.map(run_shard, shards))
+        candidates = {cat: text for cat, text in zip(shards, results) if text}
+        print(f"   - 후보 분석 완료: {len(candidates)}/{len(shards)}개 ({time.time() - started:.1f}s)")
+        if not candidates:
+            raise RuntimeError("모든 바스켓 분석이 실패했습니다.")
+
+        candidate_block = "".join(f"\n## 후보 출처: {cat}\n{text}\n" for cat, text in candidates.items())
+        reduce_task = """
+[최종 통합 단계]
+- 위 [바스켓별 후보 이슈]를 검토하여 보고서 작성 포맷에 따라 1번부터 20번까지 최종 보고서를 작성하십시오.
+- 데이터 활용 가이드(Basket Mapping)에 따라 순위를 정하고, 같은 사건을 다룬 후보는 하나로 통합하십시오.
+- 후보에 적힌 기사 번호([#N])는 **그대로** 유지하고, 후보에 없는 사실을 새로 만들지 마십시오.
+"""
+        reduce_prompt = self._build_dynamic_prompt({}, previous_reports=previous_reports, closing=reduce_task,
+                                                   data_block="[바스켓별 후보 이슈]\n" + candidate_block)
+        text = self._generate_text("reduce", static_prompt, reduce_prompt, files)
+        if text is None:
+            raise RuntimeError("최종 통합 단계가 실패했습니다.")
+        print(f"✅ 맵리듀스 생성 완료 ({time.time() - started:.1f}s)")
+        return text
+
+    def _generate_text(self, label, static_prompt, dynamic_prompt, files):
+        """
+        One generation; returns the text or None. Retries on 429/5xx are left to the backend,
+        and a failed call on the cached prefix already falls back to the full prompt in _generate().
+        """
+        import time
+
+        try:
+            started = time.time()
+            text = self._generate(static_prompt, dynamic_prompt, files).text
+            print(f"   - {label} 완료 ({time.time() - started:.1f}s)")
+            return text
+        except Exception as e:
+            print(f"   - {label} 실패: {e}")
+            return None
+
+    def _pack_inputs(self, news_data, previous_reports, fixed_text=""):
+        """
+        Trims articles and history to PROMPT_TOKEN_BUDGET (Basket A/C first, then B/D, then Recall).
+        """
+        packer = PromptPacker(self.prompt_token_budget)
+        packed_news, packed_reports = packer.pack(
+            news_data, previous_reports,
+            fixed_tokens=estimate_tokens(fixed_text),
+            render_article=lambda item: self._format_article(0, item)
         )
-        return response.text
+        print("🧮 프롬프트 예산 적용:")
+        for line in packer.summary().splitlines():
+            print(f"   - {line}")
+        return packed_news, packed_reports
+
+    def _generate(self, static_prompt, dynamic_prompt, files, stream=False):
+        """
+        Sends the prompt, reusing the cached static prefix (instructions + minutes) when available.
+        If a call on the cached prefix fails (e.g. the cache expired or was deleted), the registry entry is
+        dropped and the full prompt is sent instead. With 'stream' it returns a chunk iterator.
+        """
+        from google.genai import types
+
+        generate = self.backend.generate_stream if stream else self.backend.generate
+        # 프롬프트 + 파일(있다면) 함께 전송
+        contents = [static_prompt + dynamic_prompt]
+        if files:
+            contents.extend(files)
+
+        cache_name = self._cached_prefix(static_prompt, files)
+        if not cache_name:
+            return generate(model=self.model_name, contents=contents)
+
+        config = types.GenerateContentConfig(cached_content=cache_name)
+        if stream:
+            return self._stream_with_fallback(config, static_prompt, dynamic_prompt, contents, files)
+        try:
+            return generate(model=self.model_name, contents=[dynamic_prompt], config=config)
+        except Exception as e:
+            self._drop_cached_prefix(static_prompt, files, e)
+            return generate(model=self.model_name, contents=contents)
+
+    def _stream_with_fallback(self, config, static_prompt, dynamic_prompt, contents, files):
+        started = False
+        try:
+            for chunk in self.backend.generate_stream(model=self.model_name, contents=[dynamic_prompt], config=config):
+                started = True
+                yield chunk
+            return
+        except Exception as e:
+            # 이미 받은 청크가 있으면 체크포인트가 이어받도록 그대로 전달
+            if started:
+                raise
+            self._drop_cached_prefix(static_prompt, files, e)
+        yield from self.backend.generate_stream(model=self.model_name, contents=contents)
+
+    def _cached_prefix(self, static_prompt, files=()):
+        if self.context_cache is None:
+            return None
+        name = self.context_cache.get_or_create(self.model_name, static_prompt, files)
+        print(f"   - {self.context_cache.summary()}")
+        return name
+
+    def _drop_cached_prefix(self, static_prompt, files, error):
+        print(f"   - 컨텍스트 캐시 사용 실패, 전체 프롬프트로 다시 전송합니다: {error}")
+        self.context_cache.invalidate(self.model_name, static_prompt, files)
+
+    def _retrieve_minutes(self, news_data):
+        """
+        Picks the minutes pages most relevant to today's articles (BM25 over the local page store).
+        Returns None when retrieval is unavailable, so the caller falls back to uploading PDFs.
+        """
+        try:
+            from minutes_store import MinutesStore
+            from minutes_retriever import MinutesRetriever
+
+            store = MinutesStore()
+            store.ingest()
+            pages = MinutesRetriever(store).retrieve(news_data, char_budget=self.minutes_char_budget)
+        except Exception as e:
+            print(f"   - 회의록 검색 실패, PDF 업로드로 대체합니다: {e}")
+            return None
+        if not pages:
+            return None
+        meetings = len({p["path"] for p in pages})
+        print(f"📄 기사 주제 기반으로 회의록 {meetings}건에서 {len(pages)}페이지를 발췌했습니다.")
+        return pages
+
+    def _upload_minutes_file(self, pdf):
+        """
+        Uploads one PDF (or reuses a cached upload). Returns the file reference, or None on failure.
+        """
+        try:
+            digest = self.upload_cache.file_hash(pdf)
+            cached = self.upload_cache.get(digest)
+            if cached:
+                # 이전 실행에서 업로드한 동일 파일이 아직 유효하면 재사용
+                try:
+                    file_ref = self.backend.get_file(cached["name"])
+                    if file_ref.state.name == "ACTIVE":
+                        print(f"   - 캐시 재사용: {os.path.basename(pdf)}")
+                        self.upload_cache.record_reuse(digest)
+                        self.file_digests[file_ref.name] = digest
+                        return file_ref
+                except Exception:
+                    pass
+                self.upload_cache.invalidate(digest)
+
+            # 파일 업로드 (한글 파일명 오류 방지를 위해 바이너리 모드로 읽기, MIME 타입 명시)
+            with open(pdf, 'rb') as f:
+                file_ref = self.backend.upload(f, config={'mime_type': 'application/pdf', 'display_name': os.path.basename(pdf)})
+            print(f"   - 업로드 완료: {os.path.basename(pdf)}")
+            self.upload_cache.put(digest, file_ref, os.path.getsize(pdf))
+            self.file_digests[file_ref.name] = digest
+            return file_ref
+        except Exception as e:
+            print(f"   - 업로드 실패 ({pdf}): {e}")
+            return None
+
+    def _prepare_minutes(self, target_files):
+        """
+        Uploads the minutes PDFs on a bounded worker pool, then waits until they are ACTIVE.
+        Returns the usable file references in the original order.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        workers = max(1, min(self.upload_workers, len(target_files)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            uploaded = [f for f in executor.map(self._upload_minutes_file, target_files) if f is not None]
+
+        self.upload_cache.save()
+        if self.upload_cache.bytes_saved:
+            print(f"   - 업로드 생략: {self.upload_cache.bytes_saved / (1024 * 1024):.1f} MB")
+
+        # 파일 처리 대기 (ACTIVE 상태 확인)
+        print("⏳ 파일 처리 대기 중...")
+        ready = self._wait_until_active(uploaded)
+        print(f"✅ 회의록 파일 준비 완료! ({len(ready)}/{len(target_files)}개)")
+        return ready
+
+    def _wait_until_active(self, files, timeout=None, base_delay=1.0, max_delay=15.0):
+        """
+        Polls every PROCESSING file concurrently with exponential backoff and jitter until it is ACTIVE.
+        Files that end up FAILED, or are still processing at the overall timeout, are dropped.
+        """
+        import random
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        timeout = timeout or self.processing_timeout
+        deadline = time.monotonic() + timeout
+        current = {f.name: f for f in files}
+        attempts = {}
+        next_check = {}
+        for f in files:
+            if f.state.name == "PROCESSING":
+                attempts[f.name] = 0
+                next_check[f.name] = time.monotonic() + base_delay
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.upload_workers, len(files)))) as executor:
+            while next_check:
+                now = time.monotonic()
+                if now >= deadline:
+                    for name in next_check:
+                        print(f"   - 처리 시간 초과로 제외: {getattr(current[name], 'display_name', name)}")
+                        current.pop(name)
+                    break
+                due = [name for name, at in next_check.items() if at <= now]
+                if not due:
+                    time.sleep(max(0.0, min(next_check.values()) - now))
+                    continue
+                results = executor.map(self._get_file_state, due)
+                for name, f in zip(due, results):
+                    if f is None:
+                        state = "PROCESSING"
+                    else:
+                        current[name] = f
+                        state = f.state.name
+                    if state == "PROCESSING":
+                        attempts[name] += 1
+                        delay = min(max_delay, base_delay * (2 ** attempts[name]))
+                        next_check[name] = time.monotonic() + delay * random.uniform(0.5, 1.0)
+                        continue
+                    del next_check[name]
+                    if state != "ACTIVE":
+                        print(f"   - 처리 실패로 제외 ({state}): {getattr(current[name], 'display_name', name)}")
+                        current.pop(name)
+
+        ready = []
+        for f in files:
+            f = current.get(f.name)
+            if f is not None and f.state.name == "ACTIVE":
+                ready.append(f)
+        return ready
+
+    def _get_file_state(self, name):
+        try:
+            return self.backend.get_file(name)
+        except Exception as e:
+            print(f"   - 상태 조회 실패 ({name}): {e}")
+            return None
 
     def create_chat_session(self, news_data):
         # 채팅 기능은 현재 사용하지 않으므로 그대로 유지하거나 필요 시 업데이트
         from google.genai import types
-        system_msg = self._build_prompt(news_data)
-        
-        chat = self.client.chats.create(
+        # generate_report와 같은 프리픽스/첨부 파일을 사용해야 같은 컨텍스트 캐시를 재사용
+        news_data, static_prompt, files = self._prepare_context(news_data)
+        dynamic_prompt = self._build_dynamic_prompt(news_data)
+        # 답변의 [#N] 인용도 보고서와 같은 번호 -> 링크로 변환
+        links = citation_links(news_data)
+
+        cache_name = self._cached_prefix(static_prompt, files)
+        if cache_name:
+            # 캐시된 프리픽스는 system instruction을 포함하므로, 기사 목록은 첫 대화로 전달
+            chat = self.backend.create_chat(
+                model=self.model_name,
+                config=types.GenerateContentConfig(cached_content=cache_name),
+                history=[
+                    types.Content(role="user", parts=[types.Part(text=dynamic_prompt)]),
+                    types.Content(role="model", parts=[types.Part(text="수집된 기사 목록을 확인했습니다.")])
+                ]
+            )
+            return CitedChat(chat, links)
+
+        history = None
+        if files:
+            # 첨부 회의록은 system instruction에 넣을 수 없으므로 첫 대화로 전달
+            history = [
+                types.Content(role="user", parts=[types.Part.from_uri(file_uri=f.uri, mime_type=f.mime_type)
+                                                  for f in files]),
+                types.Content(role="model", parts=[types.Part(text="첨부된 회의록을 확인했습니다.")])
+            ]
+        chat = self.backend.create_chat(
             model=self.model_name,
             config=types.GenerateContentConfig(
-                system_instruction=system_msg
-            )
+                system_instruction=static_prompt + dynamic_prompt
+            ),
+            history=history
         )
-        return chat
-
-    def _build_prompt(self, news_data, has_minutes=False, previous_reports=None):
-        news_summary = ""
-        link_index = 1
-        for cat, items in news_data.items():
-            news_summary += f"\n### 섹션: {cat}\n"
-            # 중복 방지를 위해 더 많은 뉴스 제공 (50 -> 100)
-            for item in items[:100]:
-                news_summary += f"- 기사[{link_index}]: {item['title']}\n  요약: {item['description']}\n  링크: {item['link']}\n"
-                link_index += 1
-        
+        return CitedChat(chat, links)
+
+    def _build_static_prompt(self, has_minutes=False, attached_minutes=None, minutes_excerpts=None):
+        """
+        Instructions that stay identical from run to run (context, minutes rules, selection rules, format),
+        followed by the retrieved minutes excerpts. Together with attached minutes files this is the
+        cacheable prefix of the prompt.
+        """
         minutes_instruction = ""
         if has_minutes:
-            minutes_instruction = """
+            minutes_source = "아래 [회의록 발췌](국회 회의록 및 국정감사 회의록 중 기사 주제와 관련된 페이지)" if minutes_excerpts \
+                else "첨부된 PDF(국회 회의록 및 국정감사 결과보고서)"
+            minutes_instruction = f"""
 [회의록 및 국정감사 교차 검증 지침] (매우 중요 - 2026년 2월 기준)
-- 첨부된 PDF(국회 회의록 및 국정감사 결과보고서) 내용을 **반드시** 정밀 분석하십시오.
+- {minutes_source} 내용을 **반드시** 정밀 분석하십시오.
 - **분석 핵심 목표**:
   1. **[미해결 이슈 추적]**: 지난 국정감사(2024년, 2025년)나 상임위 회의에서 지적되었으나, **여전히 개선되지 않았거나 이행이 지지부진한 사안**을 발굴하십시오.
   2. **[거짓 해명 포착]**: 현 장관/차관의 최근 발언이나 뉴스가 과거 회의록의 발언과 모순되는 점을 찾으십시오.
@@ -98,25 +484,10 @@ class LLMProcessor:
   - 미해결 이슈 발견 시, **[회의록 팩트체크]** 섹션에 **정확한 근거(회의명, 날짜, 페이지, 발언자, 발언 원문)**를 명시해야 합니다.
   - "과거에 지적되었다"라고 뭉뚱그리지 말고, **"2024년 국정감사 (p.150)에서 OOO 의원이 지적했으나..."**와 같이 구체적으로 적시하십시오.
 """
-
-    
-        history_instruction = ""
-        if previous_reports:
-            history_instruction = f"""
-[🚫 중복 및 연속성 관리 지침 (Modified)]
-1. **[1번 ~ 5번 이슈 (핵심 추적)]**:
-   - **중복 허용 (조건부)**: 직전 보고서에 나왔던 이슈라도, **"현재 시점에서 가장 중요하고 시급한 국정 현안"**이라면 1~5번에 다시 포함시키십시오.
-   - **작성 지침**: 단순 반복은 지양하고, **심층 분석**이나 **새로운 쟁점/업데이트된 현황**을 반드시 추가하여 '연속성 있는 보고'가 되도록 하십시오.
-
-2. **[6번 ~ 20번 이슈 (다양성 확보)]**:
-   - **절대 중복 금지**: 6번부터 20번까지는 아래 [최근 보고서 이슈 목록]에 포함된 내용과 겹치는 기사를 **무조건 제외**하십시오.
-   - **완전 신규 발굴**: 이 구간은 아직 다루지 않은 **새로운 이슈(New Topics)**로만 채워야 합니다.
-
-[최근 보고서 이슈 목록 (6~20번 중복 배제용)]
-{"="*30}
-{chr(10).join(previous_reports[:3])} 
-{"="*30}
-"""
+            if attached_minutes:
+                # 실제로 첨부된 회의록만 근거로 인용하도록 목록 명시
+                minutes_instruction += "- **첨부된 회의록 목록** (이 목록에 없는 회의록은 인용하지 마십시오):\n"
+                minutes_instruction += "".join(f"  - {name}\n" for name in attached_minutes)
 
         prompt = f"""
 [기본 정보 및 맥락]
@@ -136,7 +507,6 @@ class LLMProcessor:
    5. **정보 유효성**: 2026년 2월 시점의 직함을 사용하고, 퇴직자는 '전 장관'으로 표기하십시오.
    6. **오류 무관용**: 여야 구도를 잘못 서술하는 순간 보고서 전체의 설득력이 사라집니다. 최종 출력 전 반드시 "인물-정당-여야" 삼각 관계를 재검증하십시오.
 
-{history_instruction}
 {minutes_instruction}
 
 [기사 선별 및 분석 지침]
@@ -145,6 +515,7 @@ class LLMProcessor:
    - **Basket B(산업)** & **Basket D(관광/민원)**: 6~20번 이슈로 활용.
 
 2. **[유사/중복 이슈 통합 원칙]**: 동일 사건은 하나의 이슈로 통합하십시오. 절대 같은 사건을 쪼개서 번호를 늘리지 마십시오.
+   - 기사에 딸린 **관련 기사**는 같은 사건의 다른 보도입니다. 해당 번호도 근거로 인용할 수 있습니다.
 
 3. **[이슈 선정 근거 작성 지침]**:
    - 각 이슈마다 해당 이슈를 선정한 이유를 **[이슈 선정 근거]** 섹션에 명확히 기술하십시오.
@@ -153,9 +524,10 @@ class LLMProcessor:
    - **11~20번**: 최근 72시간 내의 시의성, 민생 직결성, 새로운 정책 발표 등을 근거로 제시하십시오.
 
 4. **🚨 [인용 및 근거 표기 지침 (중요도 1순위)]**:
-   - **[현안 개요 및 국민적 관심사]** 섹션과 **[정부 대응의 문제점 및 쟁점]** 섹션의 **모든 문장** 끝에는 반드시 근거 기사 번호([N])와 링크를 달아야 합니다.
+   - **[현안 개요 및 국민적 관심사]** 섹션과 **[정부 대응의 문제점 및 쟁점]** 섹션의 **모든 문장** 끝에는 반드시 근거 기사 번호를 **[#N]** 형식으로 달아야 합니다.
+   - 링크(URL)는 직접 쓰지 마십시오. 기사 번호는 시스템이 원문 링크로 자동 연결합니다. 목록에 없는 번호는 절대 만들지 마십시오.
    - **단 하나의 문장도 근거 없이 기술하지 마십시오.** (신뢰도와 직결되는 사항임)
-   - 예시: "문체부의 예산 집행률은 40%에 불과합니다.<sup><a href='...' target='_blank'>[5]</a></sup>"
+   - 예시: "문체부의 예산 집행률은 40%에 불과합니다.[#5]" / 근거가 여럿이면 "...[#5][#12]"
 
 [보고서 작성 포맷 (엄수)]
 
@@ -170,11 +542,11 @@ class LLMProcessor:
 **[이슈 선정 근거]**
 [해당 이슈를 선정한 구체적인 이유 서술]
 
-**[현안 개요 및 국민적 관심사]** (🚨 **모든 문장에 근거 링크 필수**)
-[내용 서술] <sup><a href="링크" target="_blank">[기사번호]</a></sup> ...
+**[현안 개요 및 국민적 관심사]** (🚨 **모든 문장에 근거 기사 번호 필수**)
+[내용 서술] [#기사번호] ...
 
-**[정부 대응의 문제점 및 쟁점]** (🚨 **모든 문장에 근거 링크 필수**)
-[내용 서술] <sup><a href="링크" target="_blank">[기사번호]</a></sup> ...
+**[정부 대응의 문제점 및 쟁점]** (🚨 **모든 문장에 근거 기사 번호 필수**)
+[내용 서술] [#기사번호] ...
 
 **[질의 포인트 및 제언]**
 ...
@@ -185,9 +557,72 @@ class LLMProcessor:
 **[회의록 팩트체크]**
 ...
 
-[수집된 데이터 (기사 목록)]
-{news_summary}
+"""
+        if minutes_excerpts:
+            prompt += "\n[회의록 발췌] (회의명 / 날짜 / 페이지 그대로 인용하십시오)\n"
+            for page in minutes_excerpts:
+                prompt += f"--- {page['meeting']} ({page['date']}) p.{page['page']} ---\n{page['text']}\n"
+        return prompt
+
+    @staticmethod
+    def _format_article(index, item):
+        """
+        One article entry. Related articles of the same event take the numbers right after 'index'.
+        """
+        # 링크 대신 기사 번호만 전달 (생성 후 citations.expand_citations가 링크로 변환)
+        line = f"- [#{index}] {item['title']}\n  요약: {item['description']}\n"
+        if item.get('body'):
+            line += f"  본문: {item['body']}\n"
+        if item.get('related'):
+            refs = ", ".join(f"[#{index + n}]" for n in range(1, len(item['related']) + 1))
+            line += f"  관련 기사: {refs}\n"
+        return line
+
+    def _build_news_sections(self, news_data):
+        """
+        Returns {category: article list text}. Article numbers run across all categories, so a single
+        category section keeps the same [N] it has in the full prompt.
+        """
+        from citations import iter_numbered
+
+        # 카테고리별 기사 수는 PromptPacker가 토큰 예산에 맞춰 결정
+        sections = {cat: f"\n### 섹션: {cat}\n" for cat in news_data}
+        for cat, article_id, item, _ in iter_numbered(news_data):
+            sections[cat] += self._format_article(article_id, item)
+        return sections
+
+    def _build_dynamic_prompt(self, news_data, previous_reports=None, categories=None, closing=None,
+                              data_block=None):
+        """
+        Per-run part of the prompt: history of recent reports and the collected articles.
+        'categories' limits the article list to those sections (map step), 'closing' replaces the final task
+        and 'data_block' replaces the article list (reduce step).
+        """
+        sections = self._build_news_sections(news_data)
+        news_summary = "".join(text for cat, text in sections.items() if categories is None or cat in categories)
+
+        history_instruction = ""
+        if previous_reports:
+            history_instruction = f"""
+[🚫 중복 및 연속성 관리 지침 (Modified)]
+1. **[1번 ~ 5번 이슈 (핵심 추적)]**:
+   - **중복 허용 (조건부)**: 직전 보고서에 나왔던 이슈라도, **"현재 시점에서 가장 중요하고 시급한 국정 현안"**이라면 1~5번에 다시 포함시키십시오.
+   - **작성 지침**: 단순 반복은 지양하고, **심층 분석**이나 **새로운 쟁점/업데이트된 현황**을 반드시 추가하여 '연속성 있는 보고'가 되도록 하십시오.
+
+2. **[6번 ~ 20번 이슈 (다양성 확보)]**:
+   - **절대 중복 금지**: 6번부터 20번까지는 아래 [최근 보고서 이슈 목록]에 포함된 내용과 겹치는 기사를 **무조건 제외**하십시오.
+   - **완전 신규 발굴**: 이 구간은 아직 다루지 않은 **새로운 이슈(New Topics)**로만 채워야 합니다.
+
+[최근 보고서 이슈 목록 (6~20번 중복 배제용)]
+{"="*30}
+{chr(10).join(previous_reports)} 
+{"="*30}
+"""
+
+        prompt = f"""
+{history_instruction}
+{data_block or "[수집된 데이터 (기사 목록)]" + chr(10) + news_summary}
 
-위 데이터를 바탕으로 의원실의 신뢰도를 높일 수 있는 **완벽하게 근거가 뒷받침된** 심층 보고서를 작성하십시오.
+{closing or "위 데이터를 바탕으로 의원실의 신뢰도를 높일 수 있는 **완벽하게 근거가 뒷받침된** 심층 보고서를 작성하십시오."}
 """
         return prompt
\ No newline at end of file
@@ -1,7 +1,9 @@
 from news_crawler import NewsCrawler
+from crawl_state import CrawlState
 from llm_processor import LLMProcessor
 from email_sender import EmailSender
-from report_history_manager import ReportHistoryManager
+from report_history_manager import ReportHistoryManager, format_digest
+import os
 import sys
 import json
 from datetime import datetime
@@ -9,7 +11,8 @@ from datetime import datetime
 def main():
     try:
         print("1. 뉴스 수집 시작...")
-        crawler = NewsCrawler()
+        # 실행 간 수집 상태를 유지하여 신규 기사 여부를 표시 (CRAWL_INCREMENTAL=1 이면 델타 수집)
+        crawler = NewsCrawler(state=CrawlState())
         news_data = crawler.get_daily_reports()
         
         # 데이터가 있는지 확인
@@ -18,10 +21,26 @@ def main():
             print("수집된 뉴스가 없습니다. 종료합니다.")
             return
 
+        # 수집 결과 누적 보관 (일자별 압축 세그먼트 + 링크 색인, ARTICLE_ARCHIVE=0 이면 비활성화)
+        if os.getenv("ARTICLE_ARCHIVE", "1").lower() not in ("0", "false", "no"):
+            from article_archive import ArticleArchive
+            archive = ArticleArchive.from_env()
+            try:
+                print(f"   - 기사 {archive.append(news_data)}건을 아카이브에 추가했습니다.")
+            finally:
+                archive.close()
+
+        # (선택) 기사 원문 본문 수집 - 요약(description)보다 풍부한 분석 맥락 제공
+        if os.getenv("ENRICH_ARTICLES", "").lower() in ("1", "true", "yes"):
+            print("   - 기사 본문 수집 중...")
+            from article_fetcher import ArticleFetcher
+            ArticleFetcher.from_env().enrich(news_data)
+
         print("2. 최근 보고서 이력 조회...")
         history_manager = ReportHistoryManager()
-        recent_reports = history_manager.get_recent_reports(limit=3)
-        print(f"   - 최근 {len(recent_reports)}개의 보고서를 참조하여 중복을 방지합니다.")
+        # 전체 보고서 대신 이슈 요약(번호/제목/대상/인용 링크)만 전달
+        recent_reports = [format_digest(d) for d in history_manager.get_recent_digests(limit=3)]
+        print(f"   - 최근 {len(recent_reports)}개의 보고서 요약을 참조하여 중복을 방지합니다.")
 
         print(f"3. AI 분석 시작 (총 {total_items}건)...")
         processor = LLMProcessor()
@@ -37,6 +56,11 @@ def main():
         
         # 히스토리에 저장
         history_manager.save_report(report_content)
+        # 보고서 생성까지 성공한 경우에만 수집 상태 반영 (실패 시 다음 실행에서 재수집)
+        crawler.state.save()
+        # 쿼리별 수율 통계 (보고서 인용 여부 포함) 누적
+        crawler.registry.record_citations(report_content, news_data)
+        crawler.registry.save()
 
         sender = EmailSender()
         if sender.send_report(report_content):
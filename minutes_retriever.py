@@ -0,0 +1,137 @@
+import hashlib
+import math
+import os
+import pickle
+import re
+from collections import Counter, defaultdict
+
+_WORD_RE = re.compile(r"[0-9A-Za-z가-힣]+")
+
+
+def tokenize(text):
+    """
+    Korean-aware tokens: character bigrams inside each word (single-syllable words kept as is),
+    lowercase for Latin words.
+    """
+    tokens = []
+    for word in _WORD_RE.findall(text.lower()):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a list of documents (inverted index of term -> [(doc, tf)]).
+    """
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(list)
+        self.doc_len = []
+        self.idf = {}
+        self.avgdl = 0.0
+
+    def build(self, texts):
+        for doc_id, text in enumerate(texts):
+            tf = Counter(tokenize(text))
+            self.doc_len.append(sum(tf.values()))
+            for term, count in tf.items():
+                self.postings[term].append((doc_id, count))
+        n = len(self.doc_len)
+        self.avgdl = (sum(self.doc_len) / n) if n else 0.0
+        self.idf = {t: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for t, p in self.postings.items()}
+        self.postings = dict(self.postings)
+        return self
+
+    def search(self, query, top_k=10):
+        """
+        Returns [(score, doc_id), ...] for the best 'top_k' documents.
+        """
+        scores = defaultdict(float)
+        k1, b, avgdl = self.k1, self.b, self.avgdl or 1.0
+        for term, qtf in Counter(tokenize(query)).items():
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf[term]
+            for doc_id, tf in postings:
+                norm = tf + k1 * (1 - b + b * self.doc_len[doc_id] / avgdl)
+                scores[doc_id] += qtf * idf * tf * (k1 + 1) / norm
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))[:top_k]
+        return [(score, doc_id) for doc_id, score in ranked]
+
+
+class MinutesRetriever:
+    """
+    Topic-driven retrieval of minutes pages: one BM25 query per basket, built from that basket's
+    article titles, and the top pages attached round-robin under a character budget.
+    The index is pickled next to the minutes store and rebuilt only when the store content changes.
+    """
+
+    def __init__(self, store, index_path=".cache/minutes_bm25.pkl"):
+        self.store = store
+        self.index_path = index_path
+        self.pages = []
+        self.index = None
+
+    def _signature(self):
+        rows = self.store.conn.execute("SELECT path, sha256 FROM files ORDER BY path").fetchall()
+        return hashlib.sha256(repr(rows).encode("utf-8")).hexdigest()
+
+    def load(self):
+        signature = self._signature()
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "rb") as f:
+                    cached = pickle.load(f)
+                if cached["signature"] == signature:
+                    self.pages, self.index = cached["pages"], cached["index"]
+                    return self
+            except Exception as e:
+                print(f"Error reading minutes index {self.index_path}: {e}")
+
+        # 본문은 저장소에서 필요할 때 다시 읽고, 색인에는 페이지 메타데이터만 보관
+        self.pages = []
+        texts = []
+        for page in self.store.iter_pages():
+            texts.append(f"{page['meeting']} {page['text']}")
+            self.pages.append({k: page[k] for k in ("path", "kind", "meeting", "date", "page")})
+        self.index = BM25Index().build(texts)
+        with open(self.index_path, "wb") as f:
+            pickle.dump({"signature": signature, "pages": self.pages, "index": self.index}, f)
+        return self
+
+    @staticmethod
+    def basket_queries(news_data, titles_per_basket=30):
+        return {cat: " ".join(item["title"] for item in items[:titles_per_basket])
+                for cat, items in news_data.items() if items}
+
+    def retrieve(self, news_data, top_k=8, char_budget=40000, page_chars=2500):
+        """
+        Returns page dicts (meeting, date, page, text) relevant to today's articles, within 'char_budget'.
+        """
+        if self.index is None:
+            self.load()
+        ranked = {cat: [doc_id for _, doc_id in self.index.search(q, top_k)]
+                  for cat, q in self.basket_queries(news_data).items()}
+
+        selected = []
+        seen = set()
+        used = 0
+        for rank in range(top_k):
+            for cat, docs in ranked.items():
+                if rank >= len(docs) or docs[rank] in seen:
+                    continue
+                doc_id = docs[rank]
+                meta = self.pages[doc_id]
+                text = (self.store.get_page(meta["path"], meta["page"]) or "")[:page_chars]
+                if used + len(text) > char_budget:
+                    return selected
+                seen.add(doc_id)
+                used += len(text)
+                selected.append(dict(meta, text=text, basket=cat))
+        return selected
@@ -0,0 +1,193 @@
+import glob
+import os
+import re
+import sqlite3
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from upload_cache import sha256_file
+
+MINUTES_DIRS = ["minutes/회의록", "minutes/국정감사"]
+_DATE_RE = re.compile(r"\((\d{4})\.(\d{2})\.(\d{2})\.?\)")
+_SPACE_RE = re.compile(r"[ \t]+")
+
+
+def parse_minutes_name(path):
+    """
+    Splits '제22대국회 ... 문화체육관광위원회(전체회의) (2024.10.07.).pdf' into (meeting name, 'YYYY-MM-DD').
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    match = _DATE_RE.search(name)
+    if not match:
+        return name.strip(), None
+    return name[:match.start()].strip(), "-".join(match.groups())
+
+
+def extract_pdf_pages(path):
+    """
+    Returns the text of every page of a PDF. Runs in a worker process.
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    pages = []
+    for page in reader.pages:
+        try:
+            text = page.extract_text() or ""
+        except Exception:
+            text = ""
+        pages.append(_SPACE_RE.sub(" ", text).strip())
+    return pages
+
+
+class MinutesStore:
+    """
+    Page-level text store for the minutes corpus, backed by SQLite.
+    Every PDF is extracted once (on a process pool) into zlib-compressed page records carrying the
+    meeting name, date and page number; a file is re-extracted only when its SHA-256 changes, and only
+    hashed when its (size, mtime) differs from the stored one.
+    """
+
+    def __init__(self, db_path=".cache/minutes.sqlite", minutes_dirs=None, extract=extract_pdf_pages):
+        self.db_path = db_path
+        self.minutes_dirs = minutes_dirs or MINUTES_DIRS
+        # 페이지 텍스트 추출 함수 (프로세스 풀에서 실행되므로 모듈 최상위 함수여야 함)
+        self.extract = extract
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY,
+                path TEXT UNIQUE NOT NULL,
+                sha256 TEXT NOT NULL,
+                kind TEXT,
+                meeting TEXT,
+                date TEXT,
+                pages INTEGER,
+                extracted_at REAL,
+                size INTEGER,
+                mtime REAL
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+                page INTEGER NOT NULL,
+                text BLOB NOT NULL,
+                PRIMARY KEY (file_id, page)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_files_date ON files(date);
+        """)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(files)")}
+        for column, kind in (("size", "INTEGER"), ("mtime", "REAL")):
+            if column not in columns:
+                # 이전 버전 DB: 열만 추가하고, 다음 적재 때 한 번 해시를 비교해 채움
+                self.conn.execute(f"ALTER TABLE files ADD COLUMN {column} {kind}")
+        self.conn.execute("PRAGMA foreign_keys = ON")
+
+    def close(self):
+        self.conn.close()
+
+    def discover(self):
+        paths = []
+        for d in self.minutes_dirs:
+            paths += glob.glob(os.path.join(d, "*.pdf")) + glob.glob(os.path.join(d, "*.PDF"))
+        return sorted(set(paths))
+
+    def ingest(self, paths=None, workers=None):
+        """
+        Extracts new or changed PDFs and drops records of deleted files. Returns the number of files extracted.
+        """
+        paths = paths if paths is not None else self.discover()
+        known = {row[0]: row[1:] for row in self.conn.execute("SELECT path, sha256, size, mtime FROM files")}
+
+        todo = []
+        touched = []
+        for path in paths:
+            st = os.stat(path)
+            entry = known.get(path)
+            if entry and entry[1] == st.st_size and entry[2] == st.st_mtime:
+                continue
+            digest = sha256_file(path)
+            if entry and entry[0] == digest:
+                # 내용은 그대로이고 수정 시각만 바뀐 경우: 재추출 없이 (크기, 수정 시각)만 갱신
+                touched.append((st.st_size, st.st_mtime, path))
+            else:
+                todo.append((path, digest, st.st_size, st.st_mtime))
+
+        removed = set(known) - set(paths)
+        if removed or touched:
+            with self.conn:
+                self.conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in removed])
+                self.conn.executemany("UPDATE files SET size = ?, mtime = ? WHERE path = ?", touched)
+
+        if not todo:
+            return 0
+
+        print(f"📚 회의록 텍스트 추출: {len(todo)}개 파일")
+        started = time.time()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [(path, digest, size, mtime, executor.submit(self.extract, path))
+                       for path, digest, size, mtime in todo]
+            for path, digest, size, mtime, future in futures:
+                # 한 파일의 추출 실패가 전체 적재를 막지 않도록 개별 처리
+                try:
+                    pages = future.result()
+                except Exception as e:
+                    print(f"   - 추출 실패 ({path}): {e}")
+                    continue
+                self._write(path, digest, pages, size, mtime)
+        print(f"✅ 추출 완료 ({time.time() - started:.1f}s)")
+        return len(todo)
+
+    def _write(self, path, digest, pages, size=None, mtime=None):
+        meeting, date = parse_minutes_name(path)
+        kind = os.path.basename(os.path.dirname(path))
+        with self.conn:
+            self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            cur = self.conn.execute(
+                "INSERT INTO files (path, sha256, kind, meeting, date, pages, extracted_at, size, mtime) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, digest, kind, meeting, date, len(pages), time.time(), size, mtime)
+            )
+            file_id = cur.lastrowid
+            self.conn.executemany(
+                "INSERT INTO pages (file_id, page, text) VALUES (?, ?, ?)",
+                [(file_id, i + 1, zlib.compress(text.encode("utf-8"))) for i, text in enumerate(pages)]
+            )
+
+    def iter_pages(self, kind=None, since=None):
+        """
+        Yields dicts (path, kind, meeting, date, page, text) page by page.
+        """
+        sql = ("SELECT f.path, f.kind, f.meeting, f.date, p.page, p.text FROM pages p "
+               "JOIN files f ON f.id = p.file_id WHERE 1=1")
+        args = []
+        if kind:
+            sql += " AND f.kind = ?"
+            args.append(kind)
+        if since:
+            sql += " AND f.date >= ?"
+            args.append(since)
+        sql += " ORDER BY f.date DESC, f.path, p.page"
+        for path, kind_, meeting, date, page, blob in self.conn.execute(sql, args):
+            yield {"path": path, "kind": kind_, "meeting": meeting, "date": date, "page": page,
+                   "text": zlib.decompress(blob).decode("utf-8")}
+
+    def get_page(self, path, page):
+        row = self.conn.execute(
+            "SELECT p.text FROM pages p JOIN files f ON f.id = p.file_id WHERE f.path = ? AND p.page = ?",
+            (path, page)
+        ).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+    def stats(self):
+        files, pages = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(pages), 0) FROM files").fetchone()
+        size = os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
+        return {"files": files, "pages": pages, "bytes": size}
+
+
+if __name__ == "__main__":
+    store = MinutesStore()
+    store.ingest()
+    s = store.stats()
+    print(f"회의록 {s['files']}개, {s['pages']}페이지, 저장소 {s['bytes'] / (1024 * 1024):.1f} MB")
@@ -0,0 +1,167 @@
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from noise_filter import clean_text
+
+
+def build_corpus(path="latest_report_data.json", scale=1, hours_span=96, seed=42):
+    """
+    Builds a search corpus from recorded articles. Each recorded article is repeated 'scale' times
+    (as re-published copies with their own links), and given a synthetic pubDate within the last 'hours_span' hours.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        news_data = json.load(f)["news_data"]
+    base = [item for items in news_data.values() for item in items]
+
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    corpus = []
+    for copy in range(scale):
+        for item in base:
+            pub = now - timedelta(hours=rng.uniform(0, hours_span))
+            suffix = "" if copy == 0 else f" ({copy})"
+            link = item["link"] if copy == 0 else f"{item['link']}#copy{copy}"
+            corpus.append({
+                "title": item["title"] + suffix,
+                "originallink": link,
+                "link": link,
+                "description": item["description"],
+                "pubDate": format_datetime(pub),
+                "_ts": pub.timestamp(),
+                "_text": clean_text(item["title"] + " " + item["description"])
+            })
+    corpus.sort(key=lambda x: x["_ts"], reverse=True)
+    return corpus
+
+
+class MockNaverServer:
+    """
+    Local stand-in for openapi.naver.com/v1/search/news.json.
+    Supports 'start'/'display' pagination, date sorting, artificial latency and 429/5xx injection.
+    """
+
+    def __init__(self, corpus, host="127.0.0.1", port=0, latency=0.05, jitter=0.02,
+                 rate_429=0.0, rate_5xx=0.0, seed=7):
+        self.corpus = corpus
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.stats = {"requests": 0, "429": 0, "5xx": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._search_cache = {}
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1/search/news.json"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def search(self, query):
+        """
+        Returns corpus items matching any word of 'query', newest first.
+        """
+        with self._lock:
+            if query in self._search_cache:
+                return self._search_cache[query]
+        words = [w for w in query.split() if len(w) > 1]
+        result = [item for item in self.corpus if any(w in item["_text"] for w in words)]
+        with self._lock:
+            self._search_cache[query] = result
+        return result
+
+    def _send(self, handler, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json; charset=utf-8")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _handle(self, handler):
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._rng.random()
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+        time.sleep(delay)
+
+        if roll < self.rate_429:
+            with self._lock:
+                self.stats["429"] += 1
+            return self._send(handler, 429, {"errorMessage": "Rate limit exceeded", "errorCode": "012"})
+        if roll < self.rate_429 + self.rate_5xx:
+            with self._lock:
+                self.stats["5xx"] += 1
+            return self._send(handler, 500, {"errorMessage": "System error", "errorCode": "500"})
+
+        params = parse_qs(urlparse(handler.path).query)
+        query = params.get("query", [""])[0]
+        display = min(100, int(params.get("display", ["10"])[0]))
+        start = int(params.get("start", ["1"])[0])
+        if start > 1000:
+            return self._send(handler, 400, {"errorMessage": "Invalid start value", "errorCode": "SE03"})
+
+        matches = self.search(query)
+        page = matches[start - 1:start - 1 + display]
+        items = [{k: v for k, v in item.items() if not k.startswith("_")} for item in page]
+        self._send(handler, 200, {
+            "lastBuildDate": format_datetime(datetime.now(timezone.utc)),
+            "total": len(matches),
+            "start": start,
+            "display": len(items),
+            "items": items
+        })
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mock Naver news search API")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = MockNaverServer(build_corpus(scale=args.scale), port=args.port, latency=args.latency,
+                             rate_429=args.rate_429, rate_5xx=args.rate_5xx)
+    print(f"Serving {len(server.corpus)} articles at {server.url} (NAVER_API_URL)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
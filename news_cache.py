@@ -0,0 +1,132 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class NewsResponseCache:
+    """
+    On-disk cache of Naver search responses, keyed by (query, display, start, sort).
+
+    Modes:
+      - "read":    read-through. Fresh entries are served from disk, misses go to the API and are stored.
+      - "refresh": always call the API and overwrite the cached entry.
+      - "offline": serve only from disk (TTL ignored), never touch the network.
+      - "off":     cache disabled.
+    Payloads are gzip-compressed JSON; the oldest entries are evicted once 'max_bytes' is exceeded.
+    """
+
+    MODES = ("read", "refresh", "offline", "off")
+
+    def __init__(self, cache_dir=".cache/naver", ttl=1800, max_bytes=50 * 1024 * 1024, mode="read"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown cache mode: {mode} (expected one of {self.MODES})")
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        # 디스크 사용량 추정치 (초과 시에만 디렉터리를 다시 훑어 정리)
+        self._size = 0
+        if self.mode != "off":
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._size = sum(os.path.getsize(os.path.join(self.cache_dir, n))
+                             for n in os.listdir(self.cache_dir) if n.endswith(".json.gz"))
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            cache_dir=os.getenv("NAVER_CACHE_DIR", ".cache/naver"),
+            ttl=int(os.getenv("NAVER_CACHE_TTL", 1800)),
+            max_bytes=int(os.getenv("NAVER_CACHE_MAX_MB", 50)) * 1024 * 1024,
+            mode=os.getenv("NAVER_CACHE_MODE", "read")
+        )
+
+    @property
+    def offline(self):
+        return self.mode == "offline"
+
+    @staticmethod
+    def key(params):
+        raw = json.dumps([params.get("query"), params.get("display"), params.get("start", 1), params.get("sort")],
+                         ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json.gz")
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def get(self, params):
+        """
+        Returns the cached item list for 'params', or None on a miss (or when the mode skips reads).
+        """
+        if self.mode in ("off", "refresh"):
+            return None
+        path = self._path(self.key(params))
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._count("misses")
+            return None
+        if not self.offline and time.time() - entry.get("stored_at", 0) > self.ttl:
+            self._count("stale")
+            self._count("misses")
+            return None
+        self._count("hits")
+        return entry.get("items", [])
+
+    def put(self, params, items):
+        if self.mode in ("off", "offline"):
+            return
+        path = self._path(self.key(params))
+        entry = {"params": params, "stored_at": time.time(), "items": items}
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.stats["stores"] += 1
+            self._size += size
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            if self._size <= self.max_bytes:
+                return
+            entries = []
+            total = 0
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".json.gz"):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                    self.stats["evictions"] += 1
+                except OSError:
+                    pass
+            self._size = total
+
+    def summary(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        rate = (self.stats["hits"] / lookups * 100) if lookups else 0.0
+        return (f"cache[{self.mode}] hit {self.stats['hits']} / miss {self.stats['misses']} "
+                f"({rate:.0f}%), stored {self.stats['stores']}, evicted {self.stats['evictions']}")
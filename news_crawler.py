@@ -1,143 +1,241 @@
+import itertools
 import os
+import threading
+import time
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from crawl_pipeline import (
+    CrawlPipeline, DateWindowStage, IncrementalStage, NearDupStage, NoiseStage, NormalizeStage, UrlDedupStage,
+    categorize
+)
+from news_cache import NewsResponseCache
+from noise_filter import NoiseFilter
+from query_registry import QueryRegistry
+from rate_limiter import TokenBucket
+from title_index import TitleIndex
 
 load_dotenv()
 
 class NewsCrawler:
-    def __init__(self):
+    def __init__(self, max_workers=None, qps=None, state=None, incremental=None, cache=None, registry=None):
         self.client_id = os.getenv("NAVER_CLIENT_ID")
         self.client_secret = os.getenv("NAVER_CLIENT_SECRET")
-        self.base_url = "https://openapi.naver.com/v1/search/news.json"
+        self.base_url = os.getenv("NAVER_API_URL", "https://openapi.naver.com/v1/search/news.json")
+        # 요청/재시도/오류 횟수 (부하 테스트 및 실행 로그용)
+        self.stats = {"requests": 0, "retries": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+        # 수집 기간 (지난 72시간)
+        self.hours_limit = 72
+        # 쿼리별 페이지네이션 상한 (날짜 정렬이므로 기간 밖 기사가 나오면 즉시 중단)
+        self.max_pages = max(1, int(os.getenv("NAVER_MAX_PAGES", 3)))
+        self.max_items = max(1, int(os.getenv("NAVER_MAX_ITEMS", 90)))
+        # 실행 간 유지되는 수집 상태 (CrawlState). incremental 모드에서는 이미 처리한 기사를 건너뜀
+        self.state = state
+        if incremental is None:
+            incremental = os.getenv("CRAWL_INCREMENTAL", "").lower() in ("1", "true", "yes")
+        self.incremental = bool(incremental and state is not None)
+        # 쿼리 세트/노이즈 키워드 설정(queries.json)과 쿼리별 수율 통계
+        self.registry = registry if registry is not None else QueryRegistry.from_env()
+        self.query_overrides = {}
+        # 제목 유사도 중복 판정 기준 (difflib ratio)
+        self.similarity_threshold = float(os.getenv("TITLE_SIMILARITY_THRESHOLD", 0.6))
 
-    def fetch_news(self, query, display=20):
-        headers = {
-            "X-Naver-Client-Id": self.client_id,
-            "X-Naver-Client-Secret": self.client_secret
-        }
+        # 동시 요청 수 (1이면 기존처럼 순차 수집)
+        self.max_workers = max(1, int(max_workers or os.getenv("NAVER_MAX_WORKERS", 4)))
+        # 네이버 검색 API 초당 호출 한도에 맞춘 토큰 버킷 (고정 sleep 대체)
+        self.rate_limiter = TokenBucket(float(qps or os.getenv("NAVER_QPS", 10)))
+
+        # 검색 응답 디스크 캐시 (재실행/오프라인 재현용, NAVER_CACHE_MODE=read|refresh|offline|off)
+        self.cache = cache if cache is not None else NewsResponseCache.from_env()
+
+        # Keep-alive 커넥션 풀을 공유하는 세션
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "X-Naver-Client-Id": self.client_id or "",
+            "X-Naver-Client-Secret": self.client_secret or ""
+        })
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _get(self, params):
+        self.rate_limiter.acquire()
+        self._count("requests")
+        return self.session.get(self.base_url, params=params, timeout=10)
+
+    def fetch_news(self, query, display=20, start=1):
         params = {
             "query": query,
             "display": display,
+            "start": start,
             "sort": "date"
         }
-        
-        import time
-        time.sleep(0.1) # Rate limit avoidance
-        
-        response = requests.get(self.base_url, headers=headers, params=params)
-        if response.status_code == 200:
-            return response.json().get("items", [])
-        elif response.status_code == 429:
-            print(f"Rate limit exceeded (429). Waiting 2 seconds...")
-            time.sleep(2)
-            # One retry attempt
-            response = requests.get(self.base_url, headers=headers, params=params)
-            if response.status_code == 200:
-                return response.json().get("items", [])
+
+        cached = self.cache.get(params)
+        if cached is not None:
+            return cached
+        if self.cache.offline:
             return []
-        else:
-            print(f"Error fetching news for {query}: {response.status_code}")
+
+        try:
+            response = self._get(params)
+            if response.status_code == 429:
+                print(f"Rate limit exceeded (429). Waiting 2 seconds...")
+                self._count("retries")
+                time.sleep(2)
+                # One retry attempt
+                response = self._get(params)
+                if response.status_code != 200:
+                    self._count("errors")
+                    return []
+        except requests.RequestException as e:
+            print(f"Error fetching news for {query}: {e}")
+            self._count("errors")
             return []
 
+        if response.status_code == 200:
+            items = response.json().get("items", [])
+            self.cache.put(params, items)
+            return items
+        print(f"Error fetching news for {query}: {response.status_code}")
+        self._count("errors")
+        return []
+
+    def fetch_news_paginated(self, query, display=30, max_pages=None, max_items=None, hours_limit=None, since=None):
+        """
+        Walks Naver's 'start' offsets for a date-sorted query.
+        Stops at the first item older than 'hours_limit' (or than 'since', an epoch high-water mark),
+        at a short page, or at the page/item caps.
+        """
+        from email.utils import parsedate_to_datetime
+        from datetime import timezone
+
+        max_pages = max_pages or self.max_pages
+        max_items = max_items or self.max_items
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_limit or self.hours_limit)
+        if since is not None:
+            cutoff = max(cutoff, datetime.fromtimestamp(since, timezone.utc))
+
+        items = []
+        start = 1
+        for _ in range(max_pages):
+            page = self.fetch_news(query, display=display, start=start)
+            reached_cutoff = False
+            for item in page:
+                try:
+                    if parsedate_to_datetime(item.get("pubDate", "")) < cutoff:
+                        reached_cutoff = True
+                        break
+                except (TypeError, ValueError):
+                    pass  # 날짜 판정은 이후 필터 단계에서 처리
+                items.append(item)
+                if len(items) >= max_items:
+                    return items
+            if reached_cutoff or len(page) < display:
+                break
+            start += display
+            if start > 1000:  # 네이버 API start 최대값
+                break
+        return items
+
+    def iter_fetch(self, queries, display=20):
+        """
+        Fetches several queries concurrently over the shared session and yields (query, items)
+        in the same order as 'queries', so that downstream dedup stays deterministic.
+        At most a few queries are buffered ahead of the consumer.
+        """
+        def fetch(q):
+            options = {"display": display, "since": self.state.high_water_mark(q) if self.incremental else None}
+            # 저수율 쿼리는 registry 설정에 따라 페이지 크기/페이지 수/건수를 줄여 호출
+            options.update(self.query_overrides.get(q, {}))
+            return self.fetch_news_paginated(q, **options)
+
+        if self.max_workers == 1 or len(queries) <= 1:
+            for q in queries:
+                yield q, fetch(q)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            remaining = iter(queries)
+            for q in itertools.islice(remaining, self.max_workers * 2):
+                pending.append((q, executor.submit(fetch, q)))
+            while pending:
+                q, future = pending.popleft()
+                for nxt in itertools.islice(remaining, 1):
+                    pending.append((nxt, executor.submit(fetch, nxt)))
+                yield q, future.result()
+
+    def fetch_many(self, queries, display=20):
+        """
+        Fetches several queries concurrently. Results are returned in the same order as 'queries'.
+        """
+        return [items for _, items in self.iter_fetch(queries, display=display)]
+
     def is_similar(self, str1, str2, threshold=0.6):
+        # 단건 비교용. 대량 중복 판정은 TitleIndex 사용
         import difflib
         return difflib.SequenceMatcher(None, str1, str2).ratio() > threshold
 
-    def get_daily_reports(self):
-        from email.utils import parsedate_to_datetime
+    def build_pipeline(self, now=None):
+        """
+        Builds the default filter stages: normalize -> noise -> date window -> URL dedup -> incremental -> near-dup.
+        """
         from datetime import timezone
-        
-        now = datetime.now(timezone.utc)
-        
-        # [노이즈 필터링 키워드] - 홍보, 행사, 단순 동정 기사 제거
-        NOT_WORDS = [
-            "축제", "페스티벌", "행사", "개최", "성황리", "기념", "캠페인", "프로모션", "할인", "이벤트", "오픈", "출시", "개막",
-            "공연", "콘서트", "팬", "팬덤", "투어", "예매", "굿즈", "기부", "후원", "전달", "봉사", "나눔", "수상", "선정", "인증", "발간", "공개", "촬영", "화보"
-        ]
-
-        # [현안 질의형 고품질 쿼리 세트]
-        categories = {
-            "Basket A: 거버넌스/감사/인사 (핵심)": [
-                "문체부 감사원 감사", "문화체육관광부 보조금 부정수급 환수", "문체부 산하기관 회계 비리 징계", 
-                "문체부 기관장 인사 논란 낙하산", "문체부 공모 선정 논란 심사위원 회의록", "문체부 국정감사 후속조치 이행"
-            ],
-            "Basket B: 콘텐츠/저작권/게임 (산업)": [
-                "저작권신탁단체 회계 불투명 감사", "저작권 신탁관리단체 징계 시정명령", "웹툰 불공정 계약 표준계약서 문체부",
-                "OTT 규제 공백 심의 가이드라인", "방송콘텐츠 제작현장 임금체불 정산지연", "게임 확률형 아이템 위반 제재", "게임물관리위원회 감사 징계"
-            ],
-            "Basket C: 체육/국제대회/인권 (스포츠)": [
-                "대한체육회 회계 감사 징계", "체육단체 보조금 부정수급 환수", "스포츠 폭력 인권 사건 조사 징계",
-                "도핑 위반 제재 종목단체", "승부조작 수사 종목단체", "국제대회 유치 예산 타당성 논란"
-            ],
-            "Basket D: 관광/지역/국립기관 (생활)": [
-                "오버투어리즘 대책 관광세 총량제", "바가지요금 민원 축제 국비 지원", "세계유산 개발 충돌 세계유산영향평가",
-                "국립박물관 미술관 안전사고 관리부실", "관광공사 사업 예산 집행 논란 감사"
-            ],
-            "Recall: 기관별 포괄 이슈 (보완)": [
-                "문화체육관광부 논란", "한국콘텐츠진흥원 논란", "한국관광공사 논란", "영화진흥위원회 논란", 
-                "대한체육회 논란", "국민체육진흥공단 논란", "게임물관리위원회 논란"
-            ]
-        }
-        all_news = {}
-        seen_titles = []
+
+        now = now or datetime.now(timezone.utc)
         seen_links = set()
-        
-        for cat, kws in categories.items():
-            cat_items = []
-            display_count = 30 # 쿼리가 구체적이므로 개수 조정 (20~30)
-            
+        return CrawlPipeline([
+            NormalizeStage(self.state),
+            # 노이즈 키워드 매칭기는 실행당 한 번만 생성
+            NoiseStage(NoiseFilter(self.registry.not_words)),
             # 모든 카테고리에 대해 지난 72시간 필터링 적용
-            hours_limit = 72
-            
-            for kw in kws:
-                news_items = self.fetch_news(kw, display=display_count)
-                for item in news_items:
-                    link = item.get("originallink", item.get("link", ""))
-                    title = item.get("title", "")
-                    description = item.get("description", "")
-                    
-                    # 0. 노이즈 필터링 (부정 키워드 포함 시 제거)
-                    # 단, 제목이나 설명에 포함된 경우 스킵
-                    is_noise = False
-                    for nw in NOT_WORDS:
-                        if nw in title or nw in description:
-                            is_noise = True
-                            break
-                    if is_noise:
-                        continue
-
-                    # 1. URL 중복 체크 (Global)
-                    if link in seen_links:
-                        continue
-                        
-                    # 2. 제목 유사도 체크 (Global) - 의미없이 비슷한 기사 제거
-                    is_dup = False
-                    for seen_title in seen_titles:
-                        if self.is_similar(title, seen_title):
-                            is_dup = True
-                            break
-                    if is_dup:
-                        continue
-
-                    pub_date_str = item.get("pubDate")
-                    if pub_date_str:
-                        try:
-                            pub_date = parsedate_to_datetime(pub_date_str)
-                            if now - pub_date > timedelta(hours=hours_limit):
-                                continue
-                        except:
-                            continue  # 날짜 파싱 실패 시 건너뜀 (안전 장치)
-                            
-                    seen_links.add(link)
-                    seen_titles.append(title)
-                    
-                    cat_items.append({
-                        "title": title,
-                        "description": item.get("description", ""),
-                        "link": link
-                    })
-            all_news[cat] = cat_items
+            DateWindowStage(now, self.hours_limit),
+            UrlDedupStage(seen_links),
+            IncrementalStage(self.state, self.incremental),
+            NearDupStage(TitleIndex(threshold=self.similarity_threshold), seen_links, self.state)
+        ])
+
+    def _source(self, categories, display):
+        jobs = [(cat, kw) for cat, kws in categories.items() for kw in kws]
+        fetched = self.iter_fetch([kw for _, kw in jobs], display=display)
+        for (cat, kw), (_, items) in zip(jobs, fetched):
+            for item in items:
+                yield {"category": cat, "query": kw, "item": item}
+
+    def iter_articles(self, categories=None, pipeline=None, display=30):
+        """
+        Streams accepted articles (dicts with category, query, title, description, link, is_new)
+        while the remaining queries are still being fetched.
+        """
+        categories = categories or self.registry.categories
+        pipeline = pipeline or self.build_pipeline()
+        self.last_pipeline = pipeline
+        return pipeline.run(self._source(categories, display))
+
+    def get_daily_reports(self, categories=None, pipeline=None):
+        if categories is None:
+            categories, self.query_overrides = self.registry.plan()
+        display_count = 30 # 쿼리가 구체적이므로 개수 조정 (20~30)
+
+        all_news = categorize(self.iter_articles(categories, pipeline, display=display_count), categories)
+        print(f"   - 단계별 통과/제외: {self.last_pipeline.summary()}")
+        self.registry.record_run(self.last_pipeline, all_news, categories)
+
+        if self.cache.mode != "off":
+            print(f"   - 검색 응답 {self.cache.summary()}")
+
+        if self.state is not None:
+            new_count = sum(1 for items in all_news.values() for item in items if item["is_new"])
+            print(f"   - 지난 실행 이후 신규 기사: {new_count}건")
             
         return all_news
 
@@ -0,0 +1,77 @@
+import html
+import re
+from collections import deque
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def clean_text(text):
+    """
+    Strips Naver's <b> highlight tags and HTML entities and collapses whitespace.
+    """
+    if not text:
+        return ""
+    text = html.unescape(_TAG_RE.sub("", text))
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+class NoiseFilter:
+    """
+    Aho-Corasick automaton over the noise keywords.
+    The automaton is built once and scans a text in a single pass regardless of the number of keywords.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = [k for k in dict.fromkeys(keywords) if k]
+        # goto[state] = {char: next_state}, fail[state], out[state] = 가장 먼저 등록된 키워드 index
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [None]
+        for i, kw in enumerate(self.keywords):
+            self._insert(kw, i)
+        self._build_links()
+
+    def _insert(self, keyword, index):
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(None)
+            state = nxt
+        if self._out[state] is None:
+            self._out[state] = index
+
+    def _build_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                # 실패 링크를 따라 도달하는 키워드도 매칭으로 전파
+                if self._out[nxt] is None:
+                    self._out[nxt] = self._out[self._fail[nxt]]
+
+    def search(self, *texts):
+        """
+        Returns the first noise keyword found in the given texts, or None.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        for text in texts:
+            state = 0
+            for ch in text:
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+                if out[state] is not None:
+                    return self.keywords[out[state]]
+        return None
@@ -0,0 +1,117 @@
+from functools import lru_cache
+
+# 토큰 추정 계수 (Gemini 토크나이저 기준 근사치: 영문 약 4자/토큰, 한글 약 1.25자/토큰)
+ASCII_CHARS_PER_TOKEN = 4.0
+NON_ASCII_TOKENS_PER_CHAR = 0.8
+
+# Basket Mapping 우선순위: A/C(1~5번 핵심) -> B/D(6~20번) -> Recall(보완)
+PRIORITY_TIERS = [("Basket A", "Basket C"), ("Basket B", "Basket D"), ("Recall",)]
+
+
+@lru_cache(maxsize=65536)
+def estimate_tokens(text):
+    """
+    Fast local token estimate (no API call). Cached, since the same article lines are estimated repeatedly.
+    """
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    non_ascii = len(text) - ascii_chars
+    return int(ascii_chars / ASCII_CHARS_PER_TOKEN + non_ascii * NON_ASCII_TOKENS_PER_CHAR) + 1
+
+
+def category_tier(category):
+    prefix = category.split(":")[0].strip()
+    for tier, names in enumerate(PRIORITY_TIERS):
+        if prefix in names:
+            return tier
+    return len(PRIORITY_TIERS)
+
+
+class PromptPacker:
+    """
+    Fits history and articles into a total input-token budget.
+    History gets at most 'history_share' of what is left after the fixed parts; articles are then added
+    tier by tier (Basket A/C, then B/D, then Recall), round-robin inside a tier, until the budget is used.
+    Whatever does not fit is reported.
+    """
+
+    def __init__(self, budget, history_share=0.2, max_per_category=100, estimator=estimate_tokens):
+        self.budget = budget
+        self.history_share = history_share
+        self.max_per_category = max_per_category
+        self.estimate = estimator
+        self.report = {}
+
+    def pack(self, news_data, previous_reports=None, fixed_tokens=0, render_article=None):
+        """
+        Returns (packed news_data, packed previous_reports). 'render_article(item)' must return the text the
+        prompt uses for one article, so its cost matches what is actually sent.
+        """
+        render_article = render_article or (lambda item: f"{item['title']}\n{item['description']}\n{item['link']}\n")
+        remaining = max(0, self.budget - fixed_tokens)
+
+        # 1. 최근 보고서 이력 (최신순, 예산 초과분은 잘라냄)
+        history_budget = int(remaining * self.history_share)
+        packed_reports = []
+        history_used = 0
+        history_cut = 0
+        for report in previous_reports or []:
+            cost = self.estimate(report)
+            if history_used + cost <= history_budget:
+                packed_reports.append(report)
+                history_used += cost
+                continue
+            left = history_budget - history_used
+            if left > 200:
+                ratio = left / cost
+                packed_reports.append(report[:int(len(report) * ratio)] + "\n...(이하 생략)")
+                history_used = history_budget
+            history_cut += 1
+        remaining -= history_used
+
+        # 2. 기사 (티어 우선순위 -> 티어 내 카테고리 라운드로빈)
+        tiers = {}
+        for cat in news_data:
+            tiers.setdefault(category_tier(cat), []).append(cat)
+        selected = {cat: set() for cat in news_data}
+        articles_used = 0
+        for tier in sorted(tiers):
+            queues = {cat: list(enumerate(news_data[cat][:self.max_per_category])) for cat in tiers[tier]}
+            progress = True
+            while progress:
+                progress = False
+                for cat, queue in queues.items():
+                    while queue:
+                        idx, item = queue.pop(0)
+                        cost = self.estimate(render_article(item))
+                        if articles_used + cost > remaining:
+                            continue
+                        selected[cat].add(idx)
+                        articles_used += cost
+                        progress = True
+                        break
+
+        packed_news = {cat: [item for i, item in enumerate(items) if i in selected[cat]]
+                       for cat, items in news_data.items()}
+        dropped = {cat: len(items) - len(packed_news[cat]) for cat, items in news_data.items()}
+        self.report = {
+            "budget": self.budget,
+            "fixed": fixed_tokens,
+            "history": history_used,
+            "articles": articles_used,
+            "total": fixed_tokens + history_used + articles_used,
+            "history_truncated": history_cut,
+            "dropped": {cat: n for cat, n in dropped.items() if n}
+        }
+        return packed_news, packed_reports
+
+    def summary(self):
+        r = self.report
+        lines = [f"입력 토큰 추정 {r['total']:,} / 예산 {r['budget']:,} "
+                 f"(고정 {r['fixed']:,}, 이력 {r['history']:,}, 기사 {r['articles']:,})"]
+        if r["history_truncated"]:
+            lines.append(f"이력 보고서 {r['history_truncated']}건 축약/제외")
+        for cat, n in r["dropped"].items():
+            lines.append(f"{cat}: 기사 {n}건 제외")
+        return "\n".join(lines)
@@ -0,0 +1,177 @@
+import json
+import os
+import re
+import time
+
+_HREF_RE = re.compile(r"""href=["']([^"']+)["']""")
+
+# 통계 항목: raw(수집), noise(노이즈 제외), window(기간 외 제외), dedup(중복 제외), kept(최종 채택), cited(보고서 인용)
+STAT_FIELDS = ("raw", "noise", "window", "dedup", "kept", "cited")
+
+
+class QueryRegistry:
+    """
+    Query set loaded from a config file (queries.json) plus per-query yield statistics persisted across runs.
+
+    Prune modes (QUERY_PRUNE_MODE):
+      - "off":        every configured query is fetched (default).
+      - "skip":       consistently low-yield queries are skipped, but re-probed every 'probe_every' runs.
+      - "downweight": low-yield queries are fetched with a single small page.
+    A query is low-yield when, over its last 'min_runs' runs, nothing it returned was cited and
+    the share of its raw hits that survived filtering stayed below 'min_yield'.
+    """
+
+    PRUNE_MODES = ("off", "skip", "downweight")
+
+    def __init__(self, config_path="queries.json", stats_path=".cache/query_stats.json", prune_mode="off",
+                 min_runs=5, min_yield=0.05, history=10, probe_every=7):
+        if prune_mode not in self.PRUNE_MODES:
+            raise ValueError(f"Unknown prune mode: {prune_mode} (expected one of {self.PRUNE_MODES})")
+        self.config_path = config_path
+        self.stats_path = stats_path
+        self.prune_mode = prune_mode
+        self.min_runs = min_runs
+        self.min_yield = min_yield
+        self.history = history
+        self.probe_every = probe_every
+
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        self.categories = config["categories"]
+        self.not_words = config.get("not_words", [])
+
+        self.stats = {"runs": 0, "queries": {}}
+        if stats_path and os.path.exists(stats_path):
+            try:
+                with open(stats_path, "r", encoding="utf-8") as f:
+                    self.stats = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error reading query stats {stats_path}: {e}")
+        self._current = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            config_path=os.getenv("QUERY_CONFIG", "queries.json"),
+            stats_path=os.getenv("QUERY_STATS", ".cache/query_stats.json"),
+            prune_mode=os.getenv("QUERY_PRUNE_MODE", "off")
+        )
+
+    def _recent(self, query):
+        entry = self.stats["queries"].get(query, {})
+        return entry.get("history", [])[-self.min_runs:]
+
+    def is_low_yield(self, query):
+        recent = self._recent(query)
+        if len(recent) < self.min_runs:
+            return False
+        raw = sum(r["raw"] for r in recent)
+        kept = sum(r["kept"] for r in recent)
+        cited = sum(r["cited"] for r in recent)
+        return cited == 0 and (raw == 0 or kept / raw < self.min_yield)
+
+    def plan(self):
+        """
+        Returns (categories, overrides) for this run.
+        'overrides' maps a down-weighted query to fetch options (display/max_pages/max_items).
+        """
+        if self.prune_mode == "off":
+            return self.categories, {}
+
+        probing = self.probe_every and (self.stats["runs"] + 1) % self.probe_every == 0
+        categories = {}
+        overrides = {}
+        for cat, queries in self.categories.items():
+            kept = []
+            for q in queries:
+                if not self.is_low_yield(q):
+                    kept.append(q)
+                elif self.prune_mode == "downweight":
+                    kept.append(q)
+                    # 한 페이지 크기 자체를 줄여 API 응답도 10건만 받음
+                    overrides[q] = {"display": 10, "max_pages": 1, "max_items": 10}
+                elif probing:
+                    kept.append(q)
+                else:
+                    print(f"   - 저수율 쿼리 제외: {q}")
+            categories[cat] = kept
+        return categories, overrides
+
+    def record_run(self, pipeline, news_data, categories=None):
+        """
+        Collects this run's per-query counters from the crawl pipeline stages.
+        'categories' is the query set actually fetched (defaults to the configured one).
+        """
+        counts = {}
+
+        def add(query, field, n):
+            counts.setdefault(query, dict.fromkeys(STAT_FIELDS, 0))[field] += n
+
+        for stage in pipeline.stages:
+            if stage.name == "normalize":
+                for q, n in stage.passed_by_query.items():
+                    add(q, "raw", n)
+            elif stage.name == "noise":
+                for q, n in stage.dropped_by_query.items():
+                    add(q, "noise", n)
+            elif stage.name == "window":
+                for q, n in stage.dropped_by_query.items():
+                    add(q, "window", n)
+            elif stage.name in ("url_dedup", "incremental", "near_dup"):
+                for q, n in stage.dropped_by_query.items():
+                    add(q, "dedup", n)
+        for items in news_data.values():
+            for item in items:
+                add(item.get("query"), "kept", 1)
+        for queries in (categories or self.categories).values():
+            for q in queries:
+                counts.setdefault(q, dict.fromkeys(STAT_FIELDS, 0))
+        counts.pop(None, None)
+        self._current = counts
+
+    def record_citations(self, report_content, news_data):
+        """
+        Counts, per query, the articles whose links are cited in the final report.
+        """
+        if self._current is None:
+            return
+        cited_links = set(_HREF_RE.findall(report_content or ""))
+        for items in news_data.values():
+            for item in items:
+                query = item.get("query")
+                if item.get("link") in cited_links and query in self._current:
+                    self._current[query]["cited"] += 1
+
+    def save(self):
+        if self._current is None or not self.stats_path:
+            return
+        now = time.time()
+        self.stats["runs"] = self.stats.get("runs", 0) + 1
+        for query, counts in self._current.items():
+            entry = self.stats["queries"].setdefault(query, {"totals": dict.fromkeys(STAT_FIELDS, 0), "history": []})
+            for field in STAT_FIELDS:
+                entry["totals"][field] = entry["totals"].get(field, 0) + counts[field]
+            entry["history"] = (entry["history"] + [dict(counts, ts=now)])[-self.history:]
+        os.makedirs(os.path.dirname(self.stats_path) or ".", exist_ok=True)
+        tmp_path = self.stats_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.stats, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.stats_path)
+        self._current = None
+
+    def summary(self):
+        """
+        One line per query: totals across all recorded runs, lowest yield first.
+        """
+        rows = []
+        for query, entry in self.stats["queries"].items():
+            t = entry["totals"]
+            rate = t["kept"] / t["raw"] if t["raw"] else 0.0
+            rows.append((rate, f"{query}: raw {t['raw']}, noise {t['noise']}, window {t['window']}, "
+                               f"dedup {t['dedup']}, kept {t['kept']} ({rate:.0%}), cited {t['cited']}"))
+        rows.sort()
+        return "\n".join(line for _, line in rows)
+
+
+if __name__ == "__main__":
+    print(QueryRegistry.from_env().summary())
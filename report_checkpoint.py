@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import re
+import time
+
+# 보고서 이슈 제목 형식: ### [N]. [이슈 제목]
+ISSUE_HEADING_RE = re.compile(r"^###\s*\[(\d+)\]\.\s*(.*)$", re.MULTILINE)
+REPORT_ISSUES = 20
+
+
+def prompt_hash(model, *parts):
+    digest = hashlib.sha256(model.encode("utf-8"))
+    for part in parts:
+        digest.update(b"\0")
+        digest.update(str(part).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def completed_issues(text, final=False):
+    """
+    Returns [(number, title), ...] of issue sections that are complete. While streaming, the last
+    heading may still be in progress, so it only counts once the next heading has started ('final' counts it).
+    """
+    headings = [(int(m.group(1)), m.group(2).strip()) for m in ISSUE_HEADING_RE.finditer(text)]
+    return headings if final else headings[:-1]
+
+
+def trim_to_complete(text):
+    """
+    Cuts the text just before the last (possibly unfinished) issue heading.
+    """
+    matches = list(ISSUE_HEADING_RE.finditer(text))
+    if len(matches) < 2:
+        return ""
+    return text[:matches[-1].start()]
+
+
+class ReportCheckpoint:
+    """
+    Incremental on-disk checkpoint of a streamed report.
+    Chunks are appended to 'path' as they arrive; a meta file records the prompt hash, so an interrupted
+    run with the same prompt can resume from the last complete issue instead of regenerating everything.
+    """
+
+    def __init__(self, path="latest_report.partial.md"):
+        self.path = path
+        self.meta_path = path + ".meta.json"
+        self.text = ""
+        self.reported = 0
+        self._file = None
+
+    def resume(self, digest):
+        """
+        Returns the completed part of a previous run for the same prompt ("" if there is none) and opens
+        the checkpoint for appending.
+        """
+        previous = ""
+        if os.path.exists(self.meta_path) and os.path.exists(self.path):
+            try:
+                with open(self.meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                if meta.get("prompt_hash") == digest:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        previous = trim_to_complete(f.read())
+            except (OSError, ValueError) as e:
+                print(f"Error reading report checkpoint {self.meta_path}: {e}")
+
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump({"prompt_hash": digest, "started_at": time.time()}, f)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write(previous)
+        self._file.flush()
+        self.text = previous
+        self.reported = len(completed_issues(previous, final=True))
+        return previous
+
+    def append(self, chunk):
+        if not chunk:
+            return
+        self.text += chunk
+        self._file.write(chunk)
+        self._file.flush()
+        done = completed_issues(self.text)
+        for number, title in done[self.reported:]:
+            print(f"   - [{number}/{REPORT_ISSUES}] 작성 완료: {title[:40]}")
+        self.reported = max(self.reported, len(done))
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def finish(self):
+        """
+        Stream completed: removes the checkpoint files and returns the full text.
+        """
+        self.close()
+        for path in (self.path, self.meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+        return self.text
@@ -1,17 +1,93 @@
 import os
+import re
 import glob
+import json
+from collections import Counter
 from datetime import datetime
 
+from report_checkpoint import ISSUE_HEADING_RE
+from report_store import ReportStore
+
+_HREF_RE = re.compile(r'href=["\']([^"\']+)["\']')
+# 핵심 대상 추출: 인물+직함, 기관명, 인용된 표현
+_PERSON_RE = re.compile(r"(?<![가-힣])([가-힣]{3})\s?(?:전\s)?(장관|차관|의원|위원장|감독|회장|이사장|사장|선수|원장)")
+# 이름 자리에 오는 수식어/조사 어미 (예: '대한 장관', '있는지 장관')
+_NOT_NAME_ENDINGS = tuple("는은을를이가의에한된할던인지로와과며고")
+_ORG_RE = re.compile(r"[가-힣A-Za-z]{2,}(?:부|청|위원회|체육회|재단|협회|공사|센터|구단|진흥원|연맹)(?![가-힣])")
+_QUOTE_RE = re.compile(r"['‘\"“]([^'’\"”]{2,20})['’\"”]")
+
+
+def extract_digest(content, max_entities=8):
+    """
+    Builds a compact digest of a report: issue number, title, cited article links and key entities.
+    """
+    matches = list(ISSUE_HEADING_RE.finditer(content))
+    issues = []
+    for i, m in enumerate(matches):
+        body = content[m.end():matches[i + 1].start() if i + 1 < len(matches) else len(content)]
+        title = m.group(2).replace("**", "").strip()
+        links = list(dict.fromkeys(_HREF_RE.findall(body)))
+        counts = Counter(f"{name} {role}" for name, role in _PERSON_RE.findall(title + "\n" + body)
+                         if not name.endswith(_NOT_NAME_ENDINGS))
+        counts.update(_ORG_RE.findall(title + "\n" + body))
+        counts.update(_QUOTE_RE.findall(title))
+        issues.append({
+            "number": int(m.group(1)),
+            "title": title,
+            "links": links,
+            "entities": [e for e, _ in counts.most_common(max_entities)]
+        })
+    return {"issues": issues}
+
+
+def format_digest(digest):
+    """
+    Renders a digest as the short text block used in the prompt's history section.
+    """
+    lines = [f"[보고서 {digest.get('report', '')}]"]
+    for issue in digest["issues"]:
+        lines.append(f"- [{issue['number']}]. {issue['title']}")
+        if issue["entities"]:
+            lines.append(f"  주요 대상: {', '.join(issue['entities'])}")
+        if issue["links"]:
+            lines.append(f"  기사: {' '.join(issue['links'])}")
+    return "\n".join(lines)
+
+
 class ReportHistoryManager:
-    def __init__(self, history_dir="history"):
+    def __init__(self, history_dir="history", store=None):
         self.history_dir = history_dir
         if not os.path.exists(self.history_dir):
             os.makedirs(self.history_dir)
+        # 전체 이력은 SQLite(FTS5)에 보관, 마크다운 파일은 최근 5개만 유지
+        self.store = store or ReportStore(os.path.join(self.history_dir, "reports.sqlite"))
+        self._import_files()
+
+    def _import_files(self):
+        """
+        Adds report_*.md files that are not in the store yet (first run, or reports written by older versions).
+        """
+        for fpath in sorted(glob.glob(os.path.join(self.history_dir, "report_*.md"))):
+            filename = os.path.basename(fpath)
+            if self.store.has(filename):
+                continue
+            try:
+                with open(fpath, "r", encoding="utf-8") as f:
+                    content = f.read()
+                digest = extract_digest(content)
+                digest["report"] = filename
+                self.store.add(filename, self._timestamp(filename), content, digest)
+            except Exception as e:
+                print(f"Error importing history file {fpath}: {e}")
+
+    @staticmethod
+    def _timestamp(filename):
+        return os.path.splitext(filename)[0][len("report_"):]
 
     def save_report(self, content):
         """
-        Saves the provided report content to a file with a timestamp.
-        Keeps only the latest 5 reports (buffer for safety, though 3 are used).
+        Saves the provided report content to a file with a timestamp and to the report store.
+        Keeps only the latest 5 report files (the store keeps everything).
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"report_{timestamp}.md"
@@ -19,6 +95,8 @@ class ReportHistoryManager:
         
         with open(filepath, "w", encoding="utf-8") as f:
             f.write(content)
+        digest = self._write_digest(filepath, content)
+        self.store.add(filename, timestamp, content, digest)
         print(f"✅ Report saved to history: {filepath}")
         
         self._cleanup_old_reports()
@@ -27,24 +105,47 @@ class ReportHistoryManager:
         """
         Returns a list of the content of the most recent 'limit' reports.
         """
-        files = glob.glob(os.path.join(self.history_dir, "report_*.md"))
-        # Sort by filename (which includes timestamp) descending
-        files.sort(reverse=True)
-        
-        recent_files = files[:limit]
-        reports = []
-        for fpath in recent_files:
-            try:
-                with open(fpath, "r", encoding="utf-8") as f:
-                    reports.append(f.read())
-            except Exception as e:
-                print(f"Error reading history file {fpath}: {e}")
-                
-        return reports
+        return [r["content"] for r in self.store.latest(limit)]
+
+    def get_recent_digests(self, limit=3):
+        """
+        Returns the digests of the most recent 'limit' reports.
+        """
+        digests = []
+        for r in self.store.latest(limit):
+            digest = r["digest"]
+            if digest is None:
+                digest = extract_digest(r["content"])
+                digest["report"] = r["filename"]
+            digests.append(digest)
+        return digests
+
+    def search_reports(self, text, limit=20):
+        """
+        Issues mentioning 'text' across the whole history: [(filename, created_at, number, title), ...].
+        """
+        return self.store.search(text, limit)
+
+    def first_appearance(self, text):
+        """
+        The earliest report whose issue titles mention 'text', or None.
+        """
+        return self.store.first_appearance(text)
+
+    @staticmethod
+    def _digest_path(report_path):
+        return os.path.splitext(report_path)[0] + ".digest.json"
+
+    def _write_digest(self, report_path, content):
+        digest = extract_digest(content)
+        digest["report"] = os.path.basename(report_path)
+        with open(self._digest_path(report_path), "w", encoding="utf-8") as f:
+            json.dump(digest, f, ensure_ascii=False, indent=2)
+        return digest
 
     def _cleanup_old_reports(self, keep_count=5):
         """
-        Deletes old reports, keeping only the latest 'keep_count'.
+        Deletes old report files, keeping only the latest 'keep_count' (they stay in the store).
         """
         files = glob.glob(os.path.join(self.history_dir, "report_*.md"))
         files.sort(reverse=True)
@@ -53,6 +154,8 @@ class ReportHistoryManager:
             for fpath in files[keep_count:]:
                 try:
                     os.remove(fpath)
+                    if os.path.exists(self._digest_path(fpath)):
+                        os.remove(self._digest_path(fpath))
                     print(f"🗑️ Old report removed: {fpath}")
                 except Exception as e:
                     print(f"Error removing old report {fpath}: {e}")
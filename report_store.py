@@ -0,0 +1,155 @@
+import json
+import os
+import sqlite3
+import threading
+
+from report_checkpoint import ISSUE_HEADING_RE
+
+
+def split_issues(content):
+    """
+    Returns [(number, title, body), ...] for every '### [N]. 제목' section of a report.
+    """
+    matches = list(ISSUE_HEADING_RE.finditer(content))
+    issues = []
+    for i, m in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+        issues.append((int(m.group(1)), m.group(2).replace("**", "").strip(), content[m.end():end].strip()))
+    return issues
+
+
+class ReportStore:
+    """
+    Long-term report history in SQLite. Reports are indexed by timestamp ('latest N' is an index scan),
+    and every issue section goes into an FTS5 index (trigram tokenizer, so Korean substrings such as
+    '체육회' match '대한체육회') for 'reports mentioning X' and 'first appearance of issue Y'.
+    Without FTS5 in the local SQLite build, the same queries fall back to LIKE scans.
+    """
+
+    def __init__(self, db_path="history/reports.sqlite"):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS reports (
+                id INTEGER PRIMARY KEY,
+                filename TEXT UNIQUE NOT NULL,
+                created_at TEXT NOT NULL,
+                content TEXT NOT NULL,
+                digest TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_reports_created ON reports(created_at);
+            CREATE TABLE IF NOT EXISTS issues (
+                id INTEGER PRIMARY KEY,
+                report_id INTEGER NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+                number INTEGER,
+                title TEXT,
+                body TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_issues_report ON issues(report_id);
+        """)
+        self.fts = self._create_fts_table()
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.commit()
+
+    def _create_fts_table(self):
+        """
+        Creates the FTS5 index. Returns False when this SQLite build has no FTS5 at all.
+        """
+        try:
+            self.conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5("
+                              "title, body, content='issues', content_rowid='id', tokenize='trigram')")
+            return True
+        except sqlite3.OperationalError:
+            pass
+        try:
+            # trigram 토크나이저가 없는 SQLite(3.34 미만)에서는 기본 토크나이저 사용
+            self.conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5("
+                              "title, body, content='issues', content_rowid='id')")
+            return True
+        except sqlite3.OperationalError as e:
+            print(f"   - SQLite FTS5 사용 불가, LIKE 검색으로 대체합니다: {e}")
+            return False
+
+    def close(self):
+        self.conn.close()
+
+    def has(self, filename):
+        return self.conn.execute("SELECT 1 FROM reports WHERE filename = ?", (filename,)).fetchone() is not None
+
+    def add(self, filename, created_at, content, digest=None):
+        """
+        Stores (or replaces) a report and indexes its issue sections.
+        """
+        with self._lock, self.conn:
+            old = self.conn.execute("SELECT id FROM reports WHERE filename = ?", (filename,)).fetchone()
+            if old:
+                self._delete(old[0])
+            report_id = self.conn.execute(
+                "INSERT INTO reports (filename, created_at, content, digest) VALUES (?, ?, ?, ?)",
+                (filename, created_at, content, json.dumps(digest, ensure_ascii=False) if digest else None)
+            ).lastrowid
+            for number, title, body in split_issues(content):
+                issue_id = self.conn.execute(
+                    "INSERT INTO issues (report_id, number, title, body) VALUES (?, ?, ?, ?)",
+                    (report_id, number, title, body)
+                ).lastrowid
+                if self.fts:
+                    self.conn.execute("INSERT INTO issues_fts (rowid, title, body) VALUES (?, ?, ?)",
+                                      (issue_id, title, body))
+        return report_id
+
+    def _delete(self, report_id):
+        for issue_id, title, body in self.conn.execute(
+                "SELECT id, title, body FROM issues WHERE report_id = ?", (report_id,)).fetchall():
+            if self.fts:
+                self.conn.execute("INSERT INTO issues_fts (issues_fts, rowid, title, body) "
+                                  "VALUES ('delete', ?, ?, ?)", (issue_id, title, body))
+        self.conn.execute("DELETE FROM reports WHERE id = ?", (report_id,))
+
+    def latest(self, limit=3):
+        """
+        Returns the newest 'limit' reports as dicts (filename, created_at, content, digest).
+        """
+        rows = self.conn.execute(
+            "SELECT filename, created_at, content, digest FROM reports ORDER BY created_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [{"filename": f, "created_at": c, "content": content, "digest": json.loads(d) if d else None}
+                for f, c, content, d in rows]
+
+    def _match(self, text, column=None):
+        """
+        SQL condition + args matching issues against 'text' (FTS phrase query, LIKE for very short text
+        or without FTS5).
+        """
+        if not self.fts or len(text) < 3:
+            if column:
+                return f"i.{column} LIKE ?", [f"%{text}%"]
+            return "(i.title LIKE ? OR i.body LIKE ?)", [f"%{text}%", f"%{text}%"]
+        phrase = '"' + text.replace('"', '""') + '"'
+        query = f"{column} : {phrase}" if column else phrase
+        return "i.id IN (SELECT rowid FROM issues_fts WHERE issues_fts MATCH ?)", [query]
+
+    def search(self, text, limit=20):
+        """
+        Reports mentioning 'text', newest first: [(filename, created_at, issue number, issue title), ...].
+        """
+        condition, args = self._match(text)
+        return self.conn.execute(
+            f"SELECT r.filename, r.created_at, i.number, i.title FROM issues i JOIN reports r ON r.id = i.report_id "
+            f"WHERE {condition} ORDER BY r.created_at DESC, i.number LIMIT ?", args + [limit]
+        ).fetchall()
+
+    def first_appearance(self, text):
+        """
+        The earliest report whose issue titles mention 'text': (filename, created_at, number, title) or None.
+        """
+        condition, args = self._match(text, column="title")
+        return self.conn.execute(
+            f"SELECT r.filename, r.created_at, i.number, i.title FROM issues i JOIN reports r ON r.id = i.report_id "
+            f"WHERE {condition} ORDER BY r.created_at, i.number LIMIT 1", args
+        ).fetchone()
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
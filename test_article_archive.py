@@ -0,0 +1,47 @@
+import gzip
+import json
+import os
+import shutil
+from datetime import datetime
+
+from article_archive import ArticleArchive
+
+def _item(n, query):
+    return {"title": f"기사 {n}", "description": "설명", "link": f"https://news.example.com/{n}",
+            "query": query, "is_new": True, "pub_ts": 1770000000.0 + n}
+
+def test_article_archive():
+    root = "test_article_archive"
+    archive = ArticleArchive(root)
+    day1 = datetime(2026, 2, 1, 9).timestamp()
+    day2 = datetime(2026, 2, 2, 9).timestamp()
+
+    print("Test: Runs append gzip members to per-day segments")
+    assert archive.append({"Basket A": [_item(1, "문체부 감사"), _item(2, "문체부 감사")],
+                           "Basket B": [_item(3, "게임 규제")]}, run_at=day1) == 3
+    archive.append({"Basket A": [_item(2, "문체부 감사")], "Basket B": [_item(4, "게임 규제")]}, run_at=day1 + 3600)
+    archive.append({"Basket A": [_item(5, "체육회 비리")]}, run_at=day2)
+    assert sorted(n for n in os.listdir(root) if n.endswith(".gz")) == \
+        ["articles-2026-02-01.jsonl.gz", "articles-2026-02-02.jsonl.gz"]
+    # 멀티 멤버 gzip 파일은 일반 도구로도 통째로 읽힘
+    with gzip.open(os.path.join(root, "articles-2026-02-01.jsonl.gz"), "rt", encoding="utf-8") as f:
+        assert len([json.loads(line) for line in f]) == 5
+
+    print("Test: Link lookup and cross-run dedup")
+    assert archive.get("https://news.example.com/4")["query"] == "게임 규제"
+    assert archive.get("https://news.example.com/404") is None
+    assert archive.seen("https://news.example.com/2") == {"first_seen": "2026-02-01", "last_seen": "2026-02-01", "runs": 2}
+    assert archive.seen("https://news.example.com/404") is None
+
+    print("Test: Filtered scans by date, category and query")
+    assert [r["link"][-1] for r in archive.scan(category="Basket B")] == ["3", "4"]
+    assert [r["link"][-1] for r in archive.scan(since="2026-02-02")] == ["5"]
+    assert [r["link"][-1] for r in archive.scan(until="2026-02-01", query="문체부 감사")] == ["1", "2", "2"]
+    assert archive.stats()["articles"] == 6 and archive.stats()["links"] == 5
+
+    archive.close()
+    shutil.rmtree(root)
+    print("✅ Article archive appends, looks up and scans.")
+
+if __name__ == "__main__":
+    test_article_archive()
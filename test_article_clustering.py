@@ -0,0 +1,34 @@
+from article_clustering import ArticleClusterer
+
+def _item(title, description, n):
+    return {"title": title, "description": description, "link": f"https://news.example.com/{n}"}
+
+def test_article_clustering():
+    items = [
+        _item("대한체육회, 회계 감사 결과 부실 운영 적발", "문체부 감사에서 대한체육회 보조금 부실 집행이 적발됐다", 1),
+        _item("문체부 관광 예산 집행률 저조", "관광 분야 예산 집행률이 40%에 그쳤다", 2),
+        _item("<b>대한체육회</b> 회계 감사서 부실 운영 드러나", "문체부 감사 결과 대한체육회 보조금 집행 부실이 드러났다", 3),
+        _item("국립중앙박물관 관람객 역대 최대", "지난해 국립중앙박물관 관람객이 역대 최대를 기록했다", 4),
+        _item("문체부 감사, 대한체육회 회계 부실 운영 적발", "대한체육회 보조금 부실 집행이 문체부 감사로 확인됐다", 5),
+    ]
+
+    print("Test: Articles about the same event form one cluster")
+    clusterer = ArticleClusterer(threshold=0.45)
+    clusters = clusterer.cluster(items)
+    assert [0, 2, 4] in clusters
+    assert [1] in clusters and [3] in clusters
+
+    print("Test: Representative keeps the other links")
+    collapsed = clusterer.collapse(items)
+    assert len(collapsed) == 3
+    event = collapsed[0]
+    links = {event["link"]} | {r["link"] for r in event["related"]}
+    assert links == {"https://news.example.com/1", "https://news.example.com/3", "https://news.example.com/5"}
+    assert "related" not in collapsed[1]
+    # 원본 기사는 변경하지 않음
+    assert "related" not in items[0]
+    print(clusterer.summary())
+    print("✅ Clustering collapses same-event articles without losing links.")
+
+if __name__ == "__main__":
+    test_article_clustering()
@@ -0,0 +1,60 @@
+import gzip
+import os
+import tempfile
+from types import SimpleNamespace
+
+BODY = "문화체육관광부는 올해 체육 단체 보조금 집행 실태를 전면 감사한다고 밝혔다. " * 6
+HTML = f"""
+<html><head><title>기사</title><script>var ad = "광고";</script></head>
+<body>
+  <nav>메뉴 홈 정치 사회</nav>
+  <div id="dic_area">{BODY}<figure>사진 설명</figure></div>
+  <footer>무단 전재 금지</footer>
+</body></html>
+"""
+
+def test_extract_body():
+    from article_fetcher import extract_body
+
+    print("Test: Known body container, boilerplate stripped")
+    text = extract_body(HTML)
+    assert text == BODY.strip()
+
+    print("Test: Falls back to the densest <p> block")
+    html = "<div><p>짧은 안내</p></div><section><p>" + BODY + "</p><p>두 번째 문단.</p></section>"
+    assert extract_body(html) == BODY.strip() + " 두 번째 문단."
+    assert extract_body("<div>본문 없음</div>") == ""
+    print("✅ Body extraction works.")
+
+def test_article_cache():
+    from article_fetcher import ArticleFetcher
+
+    with tempfile.TemporaryDirectory() as tmp:
+        calls = []
+
+        def fake_get(url, timeout=None):
+            calls.append(url)
+            return SimpleNamespace(content=HTML.encode("utf-8"), raise_for_status=lambda: None)
+
+        print("Test: Fetched text is stored once per content hash")
+        fetcher = ArticleFetcher(cache_dir=tmp)
+        fetcher.session.get = fake_get
+        news_data = {"A": [{"link": "http://a/1"}, {"link": "http://b/1"}]}
+        fetcher.enrich(news_data)
+        assert news_data["A"][0]["body"] == BODY.strip()[:fetcher.max_chars]
+        assert fetcher.stats["fetched"] == 2 and len(calls) == 2
+        stored = [n for n in os.listdir(tmp) if n.endswith(".txt.gz")]
+        assert len(stored) == 1
+        with gzip.open(os.path.join(tmp, stored[0]), "rt", encoding="utf-8") as f:
+            assert f.read() == BODY.strip()
+
+        print("Test: Next run reads from the cache without downloading")
+        rerun = ArticleFetcher(cache_dir=tmp)
+        rerun.session.get = fake_get
+        assert rerun.fetch("http://a/1") == BODY.strip()
+        assert rerun.stats["cached"] == 1 and len(calls) == 2
+    print("✅ Article text cache round trip works.")
+
+if __name__ == "__main__":
+    test_extract_body()
+    test_article_cache()
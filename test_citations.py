@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+
+from citations import CitedChat, citation_links, expand_citations
+
+def test_citations():
+    news = {
+        "Basket A: 거버넌스/감사": [
+            {"title": "감사 결과", "description": "", "link": "https://news.example.com/1",
+             "related": [{"title": "감사 후속", "link": "https://news.example.com/2"}]},
+        ],
+        "Basket B: 산업": [{"title": "게임 규제", "description": "", "link": "https://news.example.com/3?a=1&b=2"}],
+    }
+
+    print("Test: Ids follow prompt order, related articles included")
+    links = citation_links(news)
+    assert links == {1: "https://news.example.com/1", 2: "https://news.example.com/2",
+                     3: "https://news.example.com/3?a=1&b=2"}
+
+    print("Test: Markers expand to canonical links")
+    text, unknown = expand_citations("감사가 부실했습니다.[#1] 후속 보도도 있습니다.[#2, #3]", links)
+    assert text == ('감사가 부실했습니다.<sup><a href="https://news.example.com/1" target="_blank">[1]</a></sup> '
+                    '후속 보도도 있습니다.<sup><a href="https://news.example.com/2" target="_blank">[2]</a></sup>'
+                    '<sup><a href="https://news.example.com/3?a=1&b=2" target="_blank">[3]</a></sup>')
+    assert unknown == []
+
+    print("Test: Unknown ids are flagged, issue headings untouched")
+    text, unknown = expand_citations("### [1]. 제목\n근거 없는 번호[#99]", links)
+    assert text == "### [1]. 제목\n근거 없는 번호<sup>[99?]</sup>"
+    assert unknown == [99]
+
+    print("Test: Chat replies are expanded with the session's ids")
+    chat = CitedChat(SimpleNamespace(send_message=lambda message: SimpleNamespace(text="후속 보도[#2], 오류[#7]")), links)
+    reply = chat.send_message("후속 보도는?")
+    assert reply.text == '후속 보도<sup><a href="https://news.example.com/2" target="_blank">[2]</a></sup>, 오류<sup>[7?]</sup>'
+    assert reply.unknown == [7] and reply.response.text == "후속 보도[#2], 오류[#7]"
+    print("✅ Citation ids expand to links.")
+
+if __name__ == "__main__":
+    test_citations()
@@ -0,0 +1,111 @@
+from context_cache import ContextCache, LocalCacheBackend
+from types import SimpleNamespace
+import os
+import shutil
+import tempfile
+
+def test_context_cache():
+    os.makedirs("test_context_cache", exist_ok=True)
+    registry = "test_context_cache/context_caches.json"
+    backend = LocalCacheBackend()
+    prefix = "고정 지침 " * 2000
+
+    print("Test: First call creates the cache")
+    cache = ContextCache(backend, registry_path=registry, ttl=600)
+    name = cache.get_or_create("gemini-2.5-pro", prefix)
+    assert name is not None and cache.stats["misses"] == 1
+
+    print("Test: Same prefix is reused (also across instances)")
+    assert cache.get_or_create("gemini-2.5-pro", prefix) == name
+    rerun = ContextCache(backend, registry_path=registry, ttl=600)
+    assert rerun.get_or_create("gemini-2.5-pro", prefix) == name
+    assert rerun.stats["hits"] == 1
+
+    print("Test: Changed prefix or short prefix")
+    assert cache.get_or_create("gemini-2.5-pro", prefix + "변경") != name
+    assert cache.get_or_create("gemini-2.5-pro", "짧은 지침") is None
+
+    print("Test: Invalidated prefix is recreated")
+    cache.invalidate("gemini-2.5-pro", prefix)
+    assert ContextCache(backend, registry_path=registry).entries.get(
+        ContextCache.fingerprint("gemini-2.5-pro", prefix, [])) is None
+    assert cache.get_or_create("gemini-2.5-pro", prefix) not in (None, name)
+    print(f"✅ {cache.summary()}")
+
+    shutil.rmtree("test_context_cache")
+
+class FakeBackend:
+    """
+    Records the cached content name of every call; calls on 'broken' caches fail like an expired cache.
+    """
+
+    def __init__(self, broken=()):
+        self.broken = set(broken)
+        self.calls = []
+
+    def _use(self, contents, config):
+        cache_name = getattr(config, "cached_content", None)
+        self.calls.append((cache_name, contents))
+        if cache_name in self.broken:
+            raise RuntimeError(f"404 {cache_name} not found")
+
+    def generate(self, model, contents, config=None):
+        self._use(contents, config)
+        return SimpleNamespace(text="### [1]. 체육회 감사\n근거 [#1]")
+
+    def create_chat(self, model, config=None, history=None):
+        self._use(history, config)
+        return SimpleNamespace(history=history)
+
+    def summary(self):
+        return f"fake {len(self.calls)} calls"
+
+def test_report_and_chat_share_prefix():
+    from llm_cache import LLMResponseCache
+    from llm_processor import LLMProcessor
+
+    news_data = {"Basket A": [{"title": "대한체육회 보조금 감사", "link": "http://a/1", "description": "감사 착수"}]}
+    pages = [{"path": "minutes/회의록/문체위 (2025.10.14.).pdf", "meeting": "문체위", "date": "2025-10-14",
+              "page": n, "text": "체육회 보조금 집행 지적 " * 200} for n in range(1, 4)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 네트워크 없이 생성 (백엔드는 아래에서 교체)
+        previous = os.environ.get("LLM_BACKEND")
+        os.environ["LLM_BACKEND"] = "replay"
+        try:
+            processor = LLMProcessor()
+        finally:
+            if previous is None:
+                os.environ.pop("LLM_BACKEND")
+            else:
+                os.environ["LLM_BACKEND"] = previous
+        processor.stream_report = False
+        processor.response_cache = LLMResponseCache(cache_dir=tmp, mode="off")
+        processor.context_cache = ContextCache(LocalCacheBackend(), registry_path=os.path.join(tmp, "caches.json"))
+        processor._minutes_files = lambda: [p["path"] for p in pages]
+        processor._retrieve_minutes = lambda news_data: pages
+        processor.backend = FakeBackend()
+
+        print("Test: Retrieved minutes make the prefix cacheable")
+        processor.generate_report(news_data)
+        report_cache = processor.backend.calls[-1][0]
+        assert report_cache is not None
+
+        print("Test: Chat session reuses the report's cache")
+        processor.create_chat_session(news_data)
+        assert processor.backend.calls[-1][0] == report_cache
+        assert processor.context_cache.stats["hits"] == 1
+
+        print("Test: Failed call on the cache falls back to the full prompt")
+        processor.backend = FakeBackend(broken=[report_cache])
+        text = processor.generate_report(news_data)
+        assert "체육회 감사" in text
+        (first, _), (second, contents) = processor.backend.calls
+        assert first == report_cache and second is None and "[회의록 발췌]" in contents[0]
+        assert processor.context_cache.stats["invalidated"] == 1
+        assert processor.context_cache.entries == {}
+    print("✅ Report and chat share one context cache, with a full-prompt fallback.")
+
+if __name__ == "__main__":
+    test_context_cache()
+    test_report_and_chat_share_prefix()
@@ -0,0 +1,48 @@
+from crawl_pipeline import (
+    CrawlPipeline, DateWindowStage, IncrementalStage, NearDupStage, NoiseStage, NormalizeStage, UrlDedupStage,
+    categorize
+)
+from noise_filter import NoiseFilter
+from title_index import TitleIndex
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+def _item(title, link, hours_ago, now):
+    return {"title": title, "description": "", "link": link, "pubDate": format_datetime(now - timedelta(hours=hours_ago))}
+
+def test_crawl_pipeline():
+    now = datetime.now(timezone.utc)
+    source = [
+        {"category": "A", "query": "q1", "item": _item("문체부 <b>감사</b> 결과 발표", "http://a/1", 1, now)},
+        {"category": "A", "query": "q1", "item": _item("지역 축제 성황리 개최", "http://a/2", 1, now)},
+        {"category": "A", "query": "q1", "item": _item("오래된 체육회 징계 기사", "http://a/3", 100, now)},
+        {"category": "B", "query": "q2", "item": _item("완전히 다른 제목의 기사", "http://a/1", 2, now)},
+        {"category": "B", "query": "q2", "item": _item("문체부 감사 결과 발표…", "http://b/1", 2, now)},
+        {"category": "B", "query": "q2", "item": _item("게임물관리위원회 확률형 아이템 제재", "http://b/2", 3, now)},
+    ]
+
+    print("Test: Running pipeline")
+    seen_links = set()
+    pipeline = CrawlPipeline([
+        NormalizeStage(),
+        NoiseStage(NoiseFilter(["축제", "개최"])),
+        DateWindowStage(now, 72),
+        UrlDedupStage(seen_links),
+        IncrementalStage(None),
+        NearDupStage(TitleIndex(), seen_links),
+    ])
+    result = categorize(pipeline.run(iter(source)), ["A", "B"])
+
+    assert [i["title"] for i in result["A"]] == ["문체부 감사 결과 발표"]
+    assert [i["link"] for i in result["B"]] == ["http://b/2"]
+
+    print("Test: Per-stage counters")
+    report = dict((name, (passed, dropped)) for name, passed, dropped in pipeline.report())
+    assert report["noise"] == (5, 1)
+    assert report["window"] == (4, 1)
+    assert report["url_dedup"] == (3, 1)
+    assert report["near_dup"] == (2, 1)
+    print(f"✅ {pipeline.summary()}")
+
+if __name__ == "__main__":
+    test_crawl_pipeline()
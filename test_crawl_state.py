@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+import time
+
+from crawl_state import CrawlState
+
+def test_crawl_state():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, ".cache", "crawl_state.json")
+        now = time.time()
+
+        print("Test: mark() keeps the first timestamp")
+        state = CrawlState(path, hours_limit=72)
+        state.mark("http://a/1", "문체부 감사 결과", timestamp=now - 100)
+        state.mark("http://a/1", "문체부 감사 결과", timestamp=now)
+        assert state.links["http://a/1"] == now - 100
+        assert state.fingerprints[CrawlState.fingerprint("문체부 감사 결과")] == now - 100
+        assert state.is_seen("http://a/other", "문체부, 감사 결과!")
+        assert not state.is_seen("http://a/2", "다른 기사")
+
+        print("Test: expire() at the window edge")
+        edge = now - 72 * 3600
+        state.mark("http://a/edge", "경계 기사", timestamp=edge)
+        state.mark("http://a/old", "오래된 기사", timestamp=edge - 1)
+        state.update_high_water("체육회", edge - 1)
+        state.update_high_water("관광", now - 10)
+        state.update_high_water("관광", now - 20)
+        state.expire(now=now)
+        assert state.has_link("http://a/edge") and not state.has_link("http://a/old")
+        assert not state.has_title("오래된 기사")
+        assert state.high_water_mark("체육회") is None
+        assert state.high_water_mark("관광") == now - 10
+
+        print("Test: save() -> load round trip")
+        state.save()
+        reloaded = CrawlState(path, hours_limit=72)
+        assert reloaded.links == state.links
+        assert reloaded.fingerprints == state.fingerprints
+        assert reloaded.high_water == state.high_water
+        assert reloaded.last_run is not None
+
+        print("Test: Corrupt file loads as empty state")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("{broken")
+        corrupt = CrawlState(path)
+        assert corrupt.links == {} and corrupt.high_water == {} and corrupt.last_run is None
+        corrupt.save()
+        with open(path, "r", encoding="utf-8") as f:
+            assert json.load(f)["links"] == {}
+    print("✅ Crawl state marks, expires and persists.")
+
+def test_high_water_cutoff():
+    from email.utils import format_datetime
+    from datetime import datetime, timedelta, timezone
+    from news_cache import NewsResponseCache
+    from news_crawler import NewsCrawler
+
+    with tempfile.TemporaryDirectory() as tmp:
+        now = datetime.now(timezone.utc)
+        # 1시간 간격, 최신순 기사 30건 (첫 페이지가 가득 차 있어야 다음 페이지로 진행)
+        page = [{"title": f"기사 {i}", "link": f"http://a/{i}", "pubDate": format_datetime(now - timedelta(hours=i))}
+                for i in range(30)]
+
+        state = CrawlState(os.path.join(tmp, "crawl_state.json"))
+        crawler = NewsCrawler(max_workers=1, state=state, incremental=True, cache=NewsResponseCache(mode="off"))
+        crawler.fetch_news = lambda query, display=20, start=1: page if start == 1 else []
+
+        print("Test: Without a high-water mark the 72h window applies")
+        assert len(crawler.fetch_news_paginated("체육회", display=30)) == 30
+
+        print("Test: The high-water mark narrows the cutoff")
+        state.update_high_water("체육회", (now - timedelta(hours=5, minutes=30)).timestamp())
+        items = [item for _, items in crawler.iter_fetch(["체육회"], display=30) for item in items]
+        assert [item["link"] for item in items] == [f"http://a/{i}" for i in range(6)]
+    print("✅ Incremental crawl stops at the previous run's newest article.")
+
+if __name__ == "__main__":
+    test_crawl_state()
+    test_high_water_cutoff()
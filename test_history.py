@@ -1,4 +1,4 @@
-from report_history_manager import ReportHistoryManager
+from report_history_manager import ReportHistoryManager, format_digest
 import os
 import time
 
@@ -39,5 +39,30 @@ def test_history_manager():
     shutil.rmtree("test_history")
     print("✅ Cleanup complete.")
 
+def test_report_digest():
+    print("Test: Digest is saved next to the report")
+    manager = ReportHistoryManager(history_dir="test_history_digest")
+    manager.save_report(
+        "시작 멘트\n\n### [1]. 대한체육회 감사 결과 '부실' 논란\n"
+        "대한체육회 회계 감사에서 유인촌 장관 시절 문제가 드러났습니다."
+        "<sup><a href=\"https://news.example.com/1\" target=\"_blank\">[3]</a></sup>\n\n"
+        "### [2]. 관광 민원 급증\n내용<sup><a href='https://news.example.com/2' target='_blank'>[7]</a></sup>\n"
+    )
+    import glob
+    assert len(glob.glob("test_history_digest/report_*.digest.json")) == 1
+
+    digests = manager.get_recent_digests(limit=3)
+    issues = digests[0]["issues"]
+    assert [i["number"] for i in issues] == [1, 2]
+    assert issues[0]["links"] == ["https://news.example.com/1"]
+    assert "대한체육회" in issues[0]["entities"] and "유인촌 장관" in issues[0]["entities"]
+    text = format_digest(digests[0])
+    assert "[1]. 대한체육회 감사 결과 '부실' 논란" in text and "https://news.example.com/2" in text
+    print("✅ Digest carries titles, entities and links.")
+
+    import shutil
+    shutil.rmtree("test_history_digest")
+
 if __name__ == "__main__":
     test_history_manager()
+    test_report_digest()
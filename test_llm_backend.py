@@ -0,0 +1,136 @@
+import shutil
+from types import SimpleNamespace
+
+import llm_backend
+from llm_backend import GeminiBackend, RecordingBackend, ReplayBackend
+
+class APIError(Exception):
+    def __init__(self, code, retry_after=None):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+        self.response = SimpleNamespace(headers={"retry-after": retry_after} if retry_after else {})
+
+def _client(failures, stream_failures=()):
+    calls = {"n": 0}
+    stream_failures = list(stream_failures)
+
+    def generate_content(model, contents, config=None):
+        calls["n"] += 1
+        if failures:
+            raise failures.pop(0)
+        return SimpleNamespace(text=f"{model}:{contents[0]}")
+
+    def generate_content_stream(model, contents, config=None):
+        if stream_failures:
+            raise stream_failures.pop(0)
+        return iter([SimpleNamespace(text="### [1]. 가\n"), SimpleNamespace(text="### [2]. 나\n")])
+
+    def create(model, config):
+        calls["n"] += 1
+        return SimpleNamespace(name=f"cachedContents/live-{calls['n']}", expire_time=None)
+
+    def send_message(message):
+        calls["n"] += 1
+        if failures:
+            raise failures.pop(0)
+        return SimpleNamespace(text=f"답변:{message}")
+
+    models = SimpleNamespace(generate_content=generate_content, generate_content_stream=generate_content_stream)
+    caches = SimpleNamespace(create=create, get=lambda name: SimpleNamespace(name=name))
+    chats = SimpleNamespace(create=lambda model, config=None, history=None: SimpleNamespace(send_message=send_message))
+    return SimpleNamespace(models=models, caches=caches, chats=chats), calls
+
+def _slot_free(backend):
+    if backend._slots.acquire(blocking=False):
+        backend._slots.release()
+        return True
+    return False
+
+def test_llm_backend():
+    print("Test: 429/503 are retried, Retry-After honored")
+    client, calls = _client([APIError(429, retry_after="0.01"), APIError(503)])
+    backend = GeminiBackend(client, base_delay=0.01, max_delay=0.02)
+    assert backend.generate("m", ["프롬프트"]).text == "m:프롬프트"
+    assert calls["n"] == 3 and backend.stats["retries"] == 2
+
+    print("Test: Client errors fail fast, deadline stops retries")
+    client, calls = _client([APIError(400)])
+    try:
+        GeminiBackend(client, base_delay=0.01).generate("m", ["x"])
+        assert False
+    except APIError:
+        assert calls["n"] == 1
+    client, calls = _client([APIError(429, retry_after="5")])
+    try:
+        GeminiBackend(client, deadline=1).generate("m", ["x"])
+        assert False
+    except APIError:
+        assert calls["n"] == 1
+
+    print("Test: Chat turns are retried like other calls")
+    client, calls = _client([APIError(503)])
+    backend = GeminiBackend(client, base_delay=0.01, max_delay=0.02)
+    chat = backend.create_chat("m", history=[])
+    assert chat.send_message("질문").text == "답변:질문"
+    assert calls["n"] == 2 and backend.stats["retries"] == 1 and _slot_free(backend)
+
+    print("Test: Retrying stream frees its slot during backoff, holds it while read")
+    client, _ = _client([], stream_failures=[APIError(503)])
+    backend = GeminiBackend(client, base_delay=0.01, max_delay=0.02, max_concurrency=1)
+    free_during_backoff = []
+    real_sleep = llm_backend.time.sleep
+    llm_backend.time.sleep = lambda seconds: free_during_backoff.append(_slot_free(backend))
+    try:
+        stream = backend.generate_stream("m", ["스트림"])
+        next(stream)
+    finally:
+        llm_backend.time.sleep = real_sleep
+    assert free_during_backoff == [True] and not _slot_free(backend)
+    assert [c.text for c in stream] == ["### [2]. 나\n"] and _slot_free(backend)
+    stream = backend.generate_stream("m", ["스트림"])
+    next(stream)
+    stream.close()
+    assert _slot_free(backend)
+
+    print("Test: Recorded responses replay offline")
+    record_dir = "test_llm_records"
+    client, _ = _client([])
+    recorder = RecordingBackend(GeminiBackend(client), record_dir)
+    file_ref = SimpleNamespace(name="files/abc123", display_name="회의록.pdf")
+    live = recorder.generate("m", ["프롬프트", file_ref]).text
+    live_chunks = [c.text for c in recorder.generate_stream("m", ["스트림"])]
+
+    replay = ReplayBackend(record_dir, latency_scale=0)
+    # 재업로드로 원격 이름이 바뀌어도 같은 기록을 찾음
+    other_ref = SimpleNamespace(name="files/zzz999", display_name="회의록.pdf")
+    assert replay.generate("m", ["프롬프트", other_ref]).text == live
+    assert [c.text for c in replay.generate_stream("m", ["스트림"])] == live_chunks
+    assert replay.upload(None, {"display_name": "회의록.pdf"}).state.name == "ACTIVE"
+    try:
+        replay.generate("m", ["녹화되지 않은 프롬프트"])
+        assert False
+    except KeyError:
+        pass
+
+    print("Test: Calls on a cached prefix are keyed by its content, not its remote name")
+    prefix = SimpleNamespace(system_instruction="고정 지침", contents=[file_ref])
+    cache = recorder.create_cache("m", prefix)
+    live = recorder.generate("m", ["기사 목록"], SimpleNamespace(cached_content=cache.name)).text
+    try:
+        replay.get_cache(cache.name)
+        assert False
+    except KeyError:
+        pass
+    same = replay.create_cache("m", SimpleNamespace(system_instruction="고정 지침", contents=[other_ref]))
+    assert replay.generate("m", ["기사 목록"], SimpleNamespace(cached_content=same.name)).text == live
+    changed = replay.create_cache("m", SimpleNamespace(system_instruction="바뀐 지침", contents=[other_ref]))
+    try:
+        replay.generate("m", ["기사 목록"], SimpleNamespace(cached_content=changed.name))
+        assert False
+    except KeyError:
+        pass
+    shutil.rmtree(record_dir)
+    print(f"✅ {replay.summary()}")
+
+if __name__ == "__main__":
+    test_llm_backend()
@@ -0,0 +1,42 @@
+import os
+import tempfile
+import time
+
+from llm_cache import LLMResponseCache
+
+def test_llm_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        print("Test: Write-through stores and serves by model, prompt and files")
+        cache = LLMResponseCache(cache_dir=tmp, mode="write")
+        key = cache.key("gemini-2.5-pro", "프롬프트", ["sha-b", "sha-a"])
+        assert key == cache.key("gemini-2.5-pro", "프롬프트", ["sha-a", "sha-b"])
+        assert key != cache.key("gemini-2.5-pro", "프롬프트 수정", ["sha-a", "sha-b"])
+        assert key != cache.key("gemini-2.5-flash", "프롬프트", ["sha-a", "sha-b"])
+        assert cache.get(key) is None
+        cache.put(key, "### [1]. 보고서", model="gemini-2.5-pro")
+        assert cache.get(key) == "### [1]. 보고서"
+
+        print("Test: Read-only serves hits but stores nothing")
+        readonly = LLMResponseCache(cache_dir=tmp, mode="read")
+        assert readonly.get(key) == "### [1]. 보고서"
+        other = readonly.key("m", "다른 프롬프트")
+        readonly.put(other, "새 보고서")
+        assert readonly.get(other) is None
+
+        print("Test: Bypass never reads")
+        assert LLMResponseCache(cache_dir=tmp, mode="off").get(key) is None
+
+        print("Test: Old and oversized entries are evicted")
+        path = os.path.join(tmp, f"{key}.json.gz")
+        old = time.time() - 3600
+        os.utime(path, (old, old))
+        aging = LLMResponseCache(cache_dir=tmp, max_age=60, mode="write")
+        aging.evict()
+        assert not os.path.exists(path)
+        small = LLMResponseCache(cache_dir=tmp, max_bytes=1, mode="write")
+        small.put(small.key("m", "a"), "x" * 1000)
+        assert os.listdir(tmp) == []
+    print("✅ LLM response cache honors modes and eviction.")
+
+if __name__ == "__main__":
+    test_llm_cache()
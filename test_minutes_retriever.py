@@ -0,0 +1,21 @@
+from minutes_retriever import BM25Index, tokenize
+
+def test_bm25_index():
+    print("Test: Korean bigram tokenization")
+    assert tokenize("체육회 감사") == ["체육", "육회", "감사"]
+
+    print("Test: BM25 ranking")
+    pages = [
+        "대한체육회 회계 감사 결과 보조금 부정수급 환수 요구",
+        "관광공사 오버투어리즘 대책 관광세 도입 논의",
+        "게임물관리위원회 확률형 아이템 제재 현황 질의",
+    ]
+    index = BM25Index().build(pages)
+    results = index.search("체육회 보조금 환수", top_k=2)
+    assert results[0][1] == 0
+    assert index.search("관광세 총량제", top_k=1)[0][1] == 1
+    assert index.search("없는단어") == []
+    print("✅ BM25 returns relevant pages first.")
+
+if __name__ == "__main__":
+    test_bm25_index()
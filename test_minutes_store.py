@@ -0,0 +1,81 @@
+import os
+import tempfile
+import time
+
+import minutes_store
+from minutes_store import MinutesStore, parse_minutes_name
+
+def fake_extract(path):
+    # PDF 대신 텍스트 파일: 빈 줄로 구분된 페이지
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().split("\n\n")
+
+def no_hash(path):
+    raise AssertionError(f"hashed unchanged file: {path}")
+
+def write(path, text, mtime=None):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+def test_parse_minutes_name():
+    print("Test: Meeting name and date from the file name")
+    path = "minutes/회의록/제22대국회 제418회 문화체육관광위원회(전체회의) (2024.10.07.).pdf"
+    assert parse_minutes_name(path) == ("제22대국회 제418회 문화체육관광위원회(전체회의)", "2024-10-07")
+    assert parse_minutes_name("minutes/국정감사/국정감사 결과보고서 (2025.01.31).PDF") == \
+        ("국정감사 결과보고서", "2025-01-31")
+    assert parse_minutes_name("minutes/회의록/날짜 없는 회의록.pdf") == ("날짜 없는 회의록", None)
+    print("✅ File names parsed.")
+
+def test_minutes_ingest():
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = os.path.join(tmp, "회의록")
+        os.makedirs(folder)
+        first = os.path.join(folder, "문화체육관광위원회 (2024.10.07.).pdf")
+        second = os.path.join(folder, "문화체육관광위원회 (2025.02.03.).pdf")
+        old = time.time() - 3600
+        write(first, "체육회 감사 지적\n\n예산 집행률", old)
+        write(second, "관광 정책 질의", old)
+        store = MinutesStore(os.path.join(tmp, "minutes.sqlite"), minutes_dirs=[folder], extract=fake_extract)
+
+        print("Test: New files are extracted page by page")
+        assert store.ingest(workers=1) == 2
+        assert store.stats()["pages"] == 3
+        assert store.get_page(first, 2) == "예산 집행률"
+
+        print("Test: Unchanged (size, mtime) skips hashing")
+        real_hash = minutes_store.sha256_file
+        minutes_store.sha256_file = no_hash
+        try:
+            assert store.ingest(workers=1) == 0
+        finally:
+            minutes_store.sha256_file = real_hash
+
+        print("Test: Touched but identical file is hashed, not re-extracted")
+        os.utime(first, None)
+        assert store.ingest(workers=1) == 0
+        minutes_store.sha256_file = no_hash
+        try:
+            assert store.ingest(workers=1) == 0
+        finally:
+            minutes_store.sha256_file = real_hash
+
+        print("Test: Changed content is re-extracted")
+        write(first, "체육회 감사 지적\n\n예산 집행률 40%\n\n후속 조치", old)
+        assert store.ingest(workers=1) == 1
+        assert store.get_page(first, 3) == "후속 조치"
+        assert store.stats()["pages"] == 4
+
+        print("Test: Deleted file cascades to its pages")
+        os.remove(second)
+        assert store.ingest(workers=1) == 0
+        assert store.get_page(second, 1) is None
+        assert store.stats()["files"] == 1
+        assert store.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0] == 3
+        store.close()
+    print("✅ Minutes store re-extracts only changed files.")
+
+if __name__ == "__main__":
+    test_parse_minutes_name()
+    test_minutes_ingest()
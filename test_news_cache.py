@@ -0,0 +1,72 @@
+import os
+import tempfile
+import time
+
+from news_cache import NewsResponseCache
+
+PARAMS = {"query": "대한체육회", "display": 30, "start": 1, "sort": "date"}
+ITEMS = [{"title": "체육회 감사", "link": "http://a/1"}]
+
+def test_news_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        print("Test: Read-through stores misses and serves fresh hits")
+        cache = NewsResponseCache(cache_dir=tmp, ttl=60, mode="read")
+        assert cache.get(PARAMS) is None
+        cache.put(PARAMS, ITEMS)
+        assert cache.get(PARAMS) == ITEMS
+        assert cache.get(dict(PARAMS, start=31)) is None
+        assert (cache.stats["hits"], cache.stats["misses"], cache.stats["stores"]) == (1, 2, 1)
+
+        print("Test: Entries past the TTL are stale")
+        path = os.path.join(tmp, f"{NewsResponseCache.key(PARAMS)}.json.gz")
+        short = NewsResponseCache(cache_dir=tmp, ttl=0, mode="read")
+        time.sleep(0.01)
+        assert short.get(PARAMS) is None and short.stats["stale"] == 1
+
+        print("Test: Refresh never reads but overwrites")
+        refresh = NewsResponseCache(cache_dir=tmp, mode="refresh")
+        assert refresh.get(PARAMS) is None
+        refresh.put(PARAMS, ITEMS + ITEMS)
+        assert cache.get(PARAMS) == ITEMS + ITEMS
+
+        print("Test: Offline serves stale entries and stores nothing")
+        offline = NewsResponseCache(cache_dir=tmp, ttl=0, mode="offline")
+        assert offline.offline and offline.get(PARAMS) == ITEMS + ITEMS
+        offline.put(dict(PARAMS, query="관광"), ITEMS)
+        assert offline.get(dict(PARAMS, query="관광")) is None
+
+        print("Test: Off neither reads nor writes")
+        off = NewsResponseCache(cache_dir=os.path.join(tmp, "off"), mode="off")
+        off.put(PARAMS, ITEMS)
+        assert off.get(PARAMS) is None and not os.path.exists(os.path.join(tmp, "off"))
+
+        print("Test: Oldest entries are evicted over max_bytes")
+        old = time.time() - 3600
+        os.utime(path, (old, old))
+        size = os.path.getsize(path)
+        bounded = NewsResponseCache(cache_dir=tmp, max_bytes=size + size // 2, mode="read")
+        bounded.put(dict(PARAMS, query="문체부"), ITEMS + ITEMS)
+        assert not os.path.exists(path)
+        assert bounded.get(dict(PARAMS, query="문체부")) == ITEMS + ITEMS
+        assert bounded.stats["evictions"] == 1
+    print("✅ News response cache honors modes, TTL and size bound.")
+
+def test_offline_crawler():
+    from news_crawler import NewsCrawler
+
+    with tempfile.TemporaryDirectory() as tmp:
+        NewsResponseCache(cache_dir=tmp, mode="read").put(PARAMS, ITEMS)
+
+        print("Test: Offline crawler never touches the network")
+        crawler = NewsCrawler(max_workers=1, cache=NewsResponseCache(cache_dir=tmp, mode="offline"))
+
+        def no_network(params):
+            raise AssertionError("network used in offline mode")
+        crawler._get = no_network
+        assert crawler.fetch_news("대한체육회", display=30) == ITEMS
+        assert crawler.fetch_news("관광", display=30) == []
+    print("✅ Offline crawl replays cached responses only.")
+
+if __name__ == "__main__":
+    test_news_cache()
+    test_offline_crawler()
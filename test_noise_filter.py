@@ -0,0 +1,22 @@
+from noise_filter import NoiseFilter, clean_text
+
+def test_noise_filter():
+    print("Test: Cleaning Naver markup")
+    assert clean_text("문체부 <b>감사</b> &quot;결과&quot;  발표") == '문체부 감사 "결과" 발표'
+
+    print("Test: Matching keywords in a single pass")
+    nf = NoiseFilter(["팬", "팬덤", "행사", "성황리", "공연"])
+    assert nf.search("아이돌 팬덤 논란") == "팬"
+    assert nf.search("평범한 제목", "행사가 성황리에 마무리") == "행사"
+    assert nf.search("대한체육회 회계 감사", "징계 요구") is None
+
+    print("Test: Same decisions as the naive keyword loop")
+    words = ["축제", "기념", "캠페인", "공개", "개막", "개최"]
+    nf = NoiseFilter(words)
+    texts = ["지역 축제 개막", "감사 결과 공개", "보조금 환수", "기념식 개최", "체육회 징계", "개회식"]
+    for t in texts:
+        assert (nf.search(t) is not None) == any(w in t for w in words)
+    print("✅ Noise filter matches naive filtering.")
+
+if __name__ == "__main__":
+    test_noise_filter()
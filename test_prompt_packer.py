@@ -0,0 +1,44 @@
+from prompt_packer import PromptPacker, estimate_tokens
+
+def _items(prefix, n):
+    return [{"title": f"{prefix} 기사 {i}", "description": "문체부 예산 집행 관련 설명 " * 3,
+             "link": f"https://news.example.com/{prefix}/{i}"} for i in range(n)]
+
+def test_prompt_packer():
+    news = {
+        "Recall: 보완 검색": _items("r", 20),
+        "Basket B: 산업": _items("b", 20),
+        "Basket A: 거버넌스/감사": _items("a", 20),
+        "Basket C: 체육계 비리": _items("c", 20),
+    }
+    per_article = estimate_tokens(news["Basket A: 거버넌스/감사"][0]["title"] + "\n"
+                                  + news["Basket A: 거버넌스/감사"][0]["description"] + "\n"
+                                  + news["Basket A: 거버넌스/감사"][0]["link"] + "\n")
+
+    print("Test: Everything fits under a large budget")
+    packer = PromptPacker(budget=10 ** 6)
+    packed, reports = packer.pack(news, ["지난 보고서"])
+    assert all(len(packed[c]) == 20 for c in news)
+    assert reports == ["지난 보고서"]
+    assert not packer.report["dropped"]
+
+    print("Test: Basket A/C are filled before B and Recall")
+    packer = PromptPacker(budget=per_article * 30, history_share=0)
+    packed, _ = packer.pack(news)
+    a, c = len(packed["Basket A: 거버넌스/감사"]), len(packed["Basket C: 체육계 비리"])
+    assert abs(a - c) <= 1 and a + c >= 27
+    assert packed["Basket B: 산업"] == [] and packed["Recall: 보완 검색"] == []
+    assert packer.report["total"] <= packer.budget
+    # 남은 기사는 원래 순서 유지
+    assert packed["Basket A: 거버넌스/감사"] == news["Basket A: 거버넌스/감사"][:a]
+
+    print("Test: History is capped by its share and truncated")
+    packer = PromptPacker(budget=2000, history_share=0.5)
+    _, reports = packer.pack({}, ["가" * 800, "나" * 800])
+    assert len(reports) == 2 and reports[1].endswith("(이하 생략)")
+    assert packer.report["history"] <= 1000 and packer.report["history_truncated"] == 1
+    print(packer.summary())
+    print("✅ Prompt packer respects the budget and basket priority.")
+
+if __name__ == "__main__":
+    test_prompt_packer()
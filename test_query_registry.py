@@ -0,0 +1,48 @@
+from query_registry import QueryRegistry
+from crawl_pipeline import CrawlPipeline, NoiseStage, NormalizeStage, categorize
+from noise_filter import NoiseFilter
+import json
+import os
+import shutil
+
+def test_query_registry():
+    os.makedirs("test_registry", exist_ok=True)
+    config_path = "test_registry/queries.json"
+    stats_path = "test_registry/query_stats.json"
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump({"not_words": ["축제"], "categories": {"A": ["good", "noisy"]}}, f, ensure_ascii=False)
+
+    print("Test: Recording runs")
+    for _ in range(3):
+        registry = QueryRegistry(config_path, stats_path, prune_mode="skip", min_runs=3, probe_every=0)
+        categories, _ = registry.plan()
+        source = [
+            {"category": "A", "query": "good", "item": {"title": "감사 결과", "link": "http://a/1"}},
+            {"category": "A", "query": "noisy", "item": {"title": "지역 축제", "link": "http://a/2"}},
+        ]
+        pipeline = CrawlPipeline([NormalizeStage(), NoiseStage(NoiseFilter(registry.not_words))])
+        news_data = categorize(pipeline.run(iter(source)), categories)
+        registry.record_run(pipeline, news_data, categories)
+        registry.record_citations("<a href='http://a/1'>[1]</a>", news_data)
+        registry.save()
+
+    totals = registry.stats["queries"]["good"]["totals"]
+    assert (totals["raw"], totals["kept"], totals["cited"]) == (3, 3, 3)
+    assert registry.stats["queries"]["noisy"]["totals"]["noise"] == 3
+    print("✅ Per-query stats accumulated.")
+
+    print("Test: Low-yield query is skipped")
+    registry = QueryRegistry(config_path, stats_path, prune_mode="skip", min_runs=3, probe_every=0)
+    categories, _ = registry.plan()
+    assert categories == {"A": ["good"]}
+
+    registry = QueryRegistry(config_path, stats_path, prune_mode="downweight", min_runs=3)
+    categories, overrides = registry.plan()
+    assert categories == {"A": ["good", "noisy"]}
+    assert overrides == {"noisy": {"display": 10, "max_pages": 1, "max_items": 10}}
+    print("✅ Pruning works.")
+
+    shutil.rmtree("test_registry")
+
+if __name__ == "__main__":
+    test_query_registry()
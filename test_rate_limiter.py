@@ -0,0 +1,66 @@
+import threading
+import time
+
+from rate_limiter import TokenBucket
+
+def test_token_bucket():
+    print("Test: A full bucket allows a burst of 'capacity' tokens")
+    bucket = TokenBucket(rate=20, capacity=5)
+    started = time.monotonic()
+    assert all(bucket.acquire() == 0.0 for _ in range(5))
+    assert time.monotonic() - started < 0.03
+
+    print("Test: An empty bucket waits about 1/rate per token")
+    waited = bucket.acquire()
+    assert 0.04 <= waited < 0.1
+
+    print("Test: Refill is proportional to elapsed time and capped at capacity")
+    time.sleep(0.1)
+    assert bucket.acquire(2) == 0.0
+    assert bucket.acquire() > 0.0
+    time.sleep(0.5)
+    started = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - started < 0.03
+    assert bucket.acquire() > 0.0
+
+    print("Test: Threads together stay within the rate")
+    bucket = TokenBucket(rate=50, capacity=1)
+    started = time.monotonic()
+    threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(5)]) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # 첫 토큰은 즉시, 나머지 19개는 초당 50개 속도
+    assert time.monotonic() - started >= 19 / 50 * 0.9
+
+    try:
+        TokenBucket(rate=0)
+        assert False
+    except ValueError:
+        pass
+    print("✅ Token bucket paces requests.")
+
+def test_fetch_many_order():
+    from news_cache import NewsResponseCache
+    from news_crawler import NewsCrawler
+
+    print("Test: Concurrent fetches are returned in input order")
+    crawler = NewsCrawler(max_workers=4, cache=NewsResponseCache(mode="off"))
+    queries = [f"쿼리{i}" for i in range(10)]
+
+    def fetch(query, **kwargs):
+        # 앞선 쿼리일수록 늦게 끝나도록
+        time.sleep(0.01 * (10 - int(query[2:])))
+        return [{"title": query}]
+    crawler.fetch_news_paginated = fetch
+
+    results = crawler.fetch_many(queries)
+    assert [items[0]["title"] for items in results] == queries
+    print("✅ fetch_many keeps the query order.")
+
+if __name__ == "__main__":
+    test_token_bucket()
+    test_fetch_many_order()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+
+from report_checkpoint import ReportCheckpoint, completed_issues, prompt_hash
+
+def _issue(n):
+    return f"### [{n}]. 이슈 {n}\n\n**[이슈 선정 근거]**\n내용 {n}\n\n"
+
+def test_report_checkpoint():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "latest_report.partial.md")
+        digest = prompt_hash("model", "static", "dynamic")
+
+        print("Test: Headings count as complete once the next one starts")
+        assert [n for n, _ in completed_issues(_issue(1) + _issue(2))] == [1]
+        assert [n for n, _ in completed_issues(_issue(1) + _issue(2), final=True)] == [1, 2]
+
+        print("Test: Interrupted stream is kept on disk")
+        cp = ReportCheckpoint(path)
+        assert cp.resume(digest) == ""
+        for chunk in ["시작 멘트\n\n", _issue(1), _issue(2), "### [3]. 이슈 3\n중간에 끊"]:
+            cp.append(chunk)
+        cp.close()
+        assert os.path.exists(path)
+
+        print("Test: Resume keeps only complete issues for the same prompt")
+        cp = ReportCheckpoint(path)
+        previous = cp.resume(digest)
+        assert [n for n, _ in completed_issues(previous, final=True)] == [1, 2]
+        assert "중간에 끊" not in previous
+        cp.append(_issue(3))
+        assert cp.finish() == previous + _issue(3)
+        assert not os.path.exists(path) and not os.path.exists(cp.meta_path)
+
+        print("Test: A different prompt starts from scratch")
+        cp = ReportCheckpoint(path)
+        cp.resume(digest)
+        cp.append(_issue(1) + _issue(2))
+        cp.close()
+        assert ReportCheckpoint(path).resume(prompt_hash("model", "static", "other")) == ""
+    print("✅ Report checkpoint resumes interrupted streams.")
+
+if __name__ == "__main__":
+    test_report_checkpoint()
@@ -0,0 +1,56 @@
+import os
+import shutil
+
+from report_store import ReportStore
+
+def _report(*titles):
+    return "시작 멘트\n\n" + "".join(f"### [{n}]. {t}\n\n**[현안 개요]**\n{t} 관련 내용\n\n"
+                                      for n, t in enumerate(titles, 1))
+
+class NoFtsReportStore(ReportStore):
+    # FTS5가 빠진 SQLite 빌드 흉내
+    def _create_fts_table(self):
+        return False
+
+def _check_store(store):
+    print("Test: Latest N by timestamp")
+    store.add("report_20260201_090000.md", "20260201_090000", _report("대한체육회 회계 부실", "관광 민원 급증"))
+    store.add("report_20260203_090000.md", "20260203_090000", _report("게임 확률형 아이템 규제"))
+    store.add("report_20260202_090000.md", "20260202_090000", _report("대한체육회 징계 감경 논란", "국립박물관 관람객"),
+              digest={"issues": []})
+    latest = store.latest(2)
+    assert [r["filename"] for r in latest] == ["report_20260203_090000.md", "report_20260202_090000.md"]
+    assert latest[1]["digest"] == {"issues": []}
+
+    print("Test: Reports mentioning X (Korean substring)")
+    hits = store.search("체육회")
+    assert [(h[0], h[2]) for h in hits] == [("report_20260202_090000.md", 1), ("report_20260201_090000.md", 1)]
+    assert store.search("존재하지 않는 이슈") == []
+
+    print("Test: First appearance of an issue")
+    assert store.first_appearance("대한체육회")[:3] == ("report_20260201_090000.md", "20260201_090000", 1)
+    assert store.first_appearance("확률형")[0] == "report_20260203_090000.md"
+
+    print("Test: Re-adding a report replaces its index entries")
+    store.add("report_20260201_090000.md", "20260201_090000", _report("관광 민원 급증"))
+    assert store.first_appearance("대한체육회")[0] == "report_20260202_090000.md"
+    assert store.count() == 3
+    store.close()
+
+def test_report_store():
+    os.makedirs("test_report_store", exist_ok=True)
+    _check_store(ReportStore("test_report_store/reports.sqlite"))
+    shutil.rmtree("test_report_store")
+    print("✅ Report store answers latest/search/first-appearance queries.")
+
+def test_report_store_without_fts():
+    os.makedirs("test_report_store_like", exist_ok=True)
+    store = NoFtsReportStore("test_report_store_like/reports.sqlite")
+    assert not store.fts
+    _check_store(store)
+    shutil.rmtree("test_report_store_like")
+    print("✅ Report store falls back to LIKE search without FTS5.")
+
+if __name__ == "__main__":
+    test_report_store()
+    test_report_store_without_fts()
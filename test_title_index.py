@@ -0,0 +1,36 @@
+from title_index import TitleIndex
+import difflib
+
+def test_title_index():
+    print("Test: Building index")
+    index = TitleIndex(threshold=0.6)
+    index.add("문체부, 산하기관 회계 비리 적발…기관장 징계 요구")
+    index.add("대한체육회 보조금 부정수급 환수 착수")
+
+    print("Test: Near-duplicate title is detected")
+    dup = "문체부 산하기관 회계 비리 적발, 기관장 징계 요구"
+    assert index.find_similar(dup) == "문체부, 산하기관 회계 비리 적발…기관장 징계 요구"
+
+    print("Test: Unrelated title is not a duplicate")
+    assert not index.is_duplicate("오버투어리즘 대책으로 관광세 도입 검토")
+
+    print("Test: Matches brute-force difflib semantics")
+    titles = [
+        "게임물관리위원회 감사 결과 징계 처분",
+        "게임물관리위원회 감사결과 징계처분 발표",
+        "웹툰 불공정 계약 표준계약서 개정",
+        "웹툰 불공정 계약, 문체부 표준계약서 개정",
+        "국립박물관 안전사고 관리부실 지적",
+    ]
+    index = TitleIndex(threshold=0.6)
+    seen = []
+    for t in titles:
+        expected = any(difflib.SequenceMatcher(None, t, s).ratio() > 0.6 for s in seen)
+        assert index.is_duplicate(t) == expected
+        if not expected:
+            seen.append(t)
+            index.add(t)
+    print(f"✅ {len(index)} unique titles, {index.comparisons} comparisons.")
+
+if __name__ == "__main__":
+    test_title_index()
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from upload_cache import EXPIRY_MARGIN, UploadCache, sha256_file
+
+def uploaded(name, expires_in):
+    return SimpleNamespace(name=name, uri=f"https://files/{name}", display_name="회의록.pdf",
+                           state=SimpleNamespace(name="ACTIVE"),
+                           expiration_time=datetime.now(timezone.utc) + timedelta(seconds=expires_in))
+
+def test_upload_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "gemini_uploads.json")
+        pdf = os.path.join(tmp, "회의록.pdf")
+        with open(pdf, "wb") as f:
+            f.write(b"%PDF-1.4 minutes")
+
+        print("Test: Local hash is memoized by (size, mtime)")
+        cache = UploadCache(path)
+        digest = cache.file_hash(pdf)
+        assert digest == sha256_file(pdf)
+        cache.hashes[pdf][2] = "memoized"
+        assert cache.file_hash(pdf) == "memoized"
+        os.utime(pdf, (time.time() + 10, time.time() + 10))
+        assert cache.file_hash(pdf) == digest
+
+        print("Test: put/get and expiry margin")
+        cache.put(digest, uploaded("files/abc", 48 * 3600), size=1000)
+        entry = cache.get(digest)
+        assert entry["name"] == "files/abc" and entry["state"] == "ACTIVE" and entry["size"] == 1000
+        cache.put("soon", uploaded("files/soon", EXPIRY_MARGIN - 60), size=10)
+        assert cache.get("soon") is None
+        cache.put("gone", uploaded("files/gone", -60), size=10)
+
+        print("Test: record_reuse counts bytes saved")
+        cache.record_reuse(digest)
+        cache.record_reuse("unknown")
+        assert cache.bytes_saved == 1000
+
+        print("Test: Persisted JSON drops expired entries")
+        cache.save()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        assert set(data["files"]) == {digest, "soon"} and pdf in data["hashes"]
+        reloaded = UploadCache(path)
+        assert reloaded.get(digest)["uri"] == "https://files/files/abc"
+        assert reloaded.file_hash(pdf) == digest and reloaded.bytes_saved == 0
+
+        print("Test: invalidate removes the entry")
+        reloaded.invalidate(digest)
+        assert reloaded.get(digest) is None
+
+        print("Test: Corrupt file starts empty")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("not json")
+        assert UploadCache(path).entries == {}
+    print("✅ Upload cache stores, reuses and persists uploads.")
+
+if __name__ == "__main__":
+    test_upload_cache()
@@ -0,0 +1,87 @@
+import difflib
+from collections import defaultdict
+
+
+class TitleIndex:
+    """
+    Near-duplicate index for news titles.
+
+    Titles are shingled into character n-grams (bigrams by default, which works well for Korean)
+    and kept in an inverted index. A new title is only compared against titles that share enough
+    n-grams with it, so each lookup touches a handful of candidates instead of every seen title.
+    Candidates are confirmed with the same difflib ratio the crawler used before (default > 0.6).
+    """
+
+    def __init__(self, threshold=0.6, ngram=2, min_overlap=0.2):
+        self.threshold = threshold
+        self.ngram = ngram
+        # 후보 선별용 n-gram Dice 계수 하한 (낮을수록 정확하지만 비교 횟수가 늘어남)
+        self.min_overlap = min_overlap
+        self.titles = []
+        self._shingles = []
+        self._postings = defaultdict(list)
+        self.comparisons = 0
+
+    def __len__(self):
+        return len(self.titles)
+
+    def _shingle(self, title):
+        text = "".join(title.split())
+        n = self.ngram
+        if len(text) < n:
+            return {text} if text else set()
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def candidates(self, title, shingles=None):
+        """
+        Returns indexes of stored titles worth comparing with 'title', most overlapping first.
+        """
+        if shingles is None:
+            shingles = self._shingle(title)
+        if not shingles:
+            return []
+
+        shared = defaultdict(int)
+        for gram in shingles:
+            for idx in self._postings.get(gram, ()):
+                shared[idx] += 1
+
+        size = len(shingles)
+        length = len(title)
+        result = []
+        for idx, count in shared.items():
+            # n-gram 겹침이 너무 적으면 유사할 가능성이 낮음
+            if 2.0 * count / (size + len(self._shingles[idx])) < self.min_overlap:
+                continue
+            # difflib ratio 상한 = 2*min(len)/(len_a+len_b)
+            other = len(self.titles[idx])
+            if 2.0 * min(length, other) / (length + other) <= self.threshold:
+                continue
+            result.append((count, idx))
+        result.sort(key=lambda x: (-x[0], x[1]))
+        return [idx for _, idx in result]
+
+    def find_similar(self, title):
+        """
+        Returns the first stored title whose similarity with 'title' exceeds the threshold, or None.
+        """
+        matcher = difflib.SequenceMatcher(None, title)
+        for idx in self.candidates(title):
+            matcher.set_seq2(self.titles[idx])
+            self.comparisons += 1
+            if matcher.real_quick_ratio() > self.threshold and \
+               matcher.quick_ratio() > self.threshold and \
+               matcher.ratio() > self.threshold:
+                return self.titles[idx]
+        return None
+
+    def is_duplicate(self, title):
+        return self.find_similar(title) is not None
+
+    def add(self, title):
+        idx = len(self.titles)
+        shingles = self._shingle(title)
+        self.titles.append(title)
+        self._shingles.append(shingles)
+        for gram in shingles:
+            self._postings[gram].append(idx)
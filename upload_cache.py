@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+# 원격 파일 만료 직전 재사용을 피하기 위한 여유 시간
+EXPIRY_MARGIN = 3600
+# expiration_time을 알 수 없을 때 가정하는 보관 기간 (Gemini Files API 기본 48시간)
+DEFAULT_TTL = 48 * 3600
+
+
+def sha256_file(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UploadCache:
+    """
+    Content-addressed cache of files uploaded to the Gemini Files API.
+    Maps the SHA-256 of a local file to its remote name, state and expiry, so unchanged PDFs are reused
+    across runs instead of being uploaded again. Local hashes are memoized by (path, size, mtime).
+    """
+
+    def __init__(self, path=".cache/gemini_uploads.json"):
+        self.path = path
+        self.entries = {}
+        self.hashes = {}
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.entries = data.get("files", {})
+                self.hashes = data.get("hashes", {})
+            except (OSError, ValueError) as e:
+                print(f"Error reading upload cache {self.path}: {e}")
+
+    def file_hash(self, path):
+        st = os.stat(path)
+        with self._lock:
+            known = self.hashes.get(path)
+        if known and known[0] == st.st_size and known[1] == st.st_mtime:
+            return known[2]
+        digest = sha256_file(path)
+        with self._lock:
+            self.hashes[path] = [st.st_size, st.st_mtime, digest]
+        return digest
+
+    def get(self, digest):
+        """
+        Returns the cache entry for 'digest' if it has not expired yet, else None.
+        """
+        with self._lock:
+            entry = self.entries.get(digest)
+        if entry and entry.get("expires_at", 0) - EXPIRY_MARGIN > time.time():
+            return entry
+        return None
+
+    def put(self, digest, file_ref, size):
+        expires_at = getattr(file_ref, "expiration_time", None)
+        if isinstance(expires_at, datetime):
+            expires_at = expires_at.timestamp()
+        else:
+            expires_at = time.time() + DEFAULT_TTL
+        state = getattr(getattr(file_ref, "state", None), "name", None)
+        with self._lock:
+            self.entries[digest] = {
+                "name": file_ref.name,
+                "uri": getattr(file_ref, "uri", None),
+                "display_name": getattr(file_ref, "display_name", None),
+                "state": state,
+                "size": size,
+                "expires_at": expires_at
+            }
+
+    def record_reuse(self, digest):
+        with self._lock:
+            self.bytes_saved += self.entries.get(digest, {}).get("size", 0)
+
+    def invalidate(self, digest):
+        with self._lock:
+            self.entries.pop(digest, None)
+
+    def save(self):
+        now = time.time()
+        with self._lock:
+            self.entries = {k: v for k, v in self.entries.items() if v.get("expires_at", 0) > now}
+            data = {"files": self.entries, "hashes": self.hashes}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)